@@ -5,6 +5,7 @@ from datetime import datetime
 import jinja2
 from flask import (
     Flask,
+    Response,
     abort,
     g,
     jsonify,
@@ -38,18 +39,34 @@ from .modules.core.utils import (
     get_result_categories_for_year,
     is_early_access,
     is_latest_year,
+    is_local_request,
     is_translated,
     load_template_combinations_optimized,
     validate_params,
 )
+from .modules.data.participant_store import PARTICIPANT_YEARS
+from .modules.data.registry import data_registry
+from .modules.maps import (
+    build_all_participants_map,
+    get_country_names,
+    get_world_map_data,
+    start_map_pregeneration,
+)
+from .modules.optimization.assets import asset_manifest, asset_url_for, send_asset
+from .modules.optimization.cache import persistent_cache
+from .modules.optimization.compression import response_compressor
+from .modules.optimization.metrics import instrument_flask_cache, metrics_registry
+from .modules.optimization.page_cache import page_cache
 from .modules.optimization.startup import (
     load_categories_parallel,
     load_result_categories_optimized,
 )
+from .modules.optimization.static_export import static_export
 from .modules.participants import (
-    create_world_map,
+    get_country_counts_all,
     get_participants_list,
     search_participants,
+    search_participants_all_years,
     total_participant_analysis,
     yearly_participant_analysis,
 )
@@ -92,7 +109,15 @@ else:
     )
     IS_LOCAL = False
 
+# ページキャッシュのヒット・ミスを統計レジストリに記録
+instrument_flask_cache(cache)
+
 babel = Babel(app)
+
+# テンプレートの url_for('static', ...) で、内容のハッシュ付きのURLを出力する
+# （ハッシュ付きのファイル名の一覧は、最初に使われた時に作成）
+asset_manifest.init_app(app)
+app.jinja_env.globals["url_for"] = asset_url_for
 test = _("test")  # テスト翻訳
 
 
@@ -102,6 +127,9 @@ test = _("test")  # テスト翻訳
 # 現在時刻を読み込む(最終更新日時として使用)
 DT_NOW, LAST_UPDATED = get_current_timestamp()
 
+# ページのETagに最終更新日時を含める（ページに表示しているため）
+app.config["BUILD_ID"] = LAST_UPDATED
+
 # 各年度の全カテゴリを取得（最適化版）
 VALID_CATEGORIES_DICT = load_categories_parallel()
 
@@ -114,9 +142,20 @@ COMBINATIONS_YEAR, COMBINATIONS_CONTENT = load_template_combinations_optimized()
 # othersテンプレート（最適化版）
 CONTENT_OTHERS = get_others_templates()
 
+# 出場者データを国データとマージ済みの状態にし、最新年度の結果を読み込んでおく
+# （他言語・他年度は初回アクセス時）
+data_registry.warmup()
+
+# 言語ごとの翻訳済みページの一覧を読み込んでおく
+persistent_cache.warmup_translated_paths()
+
 # プルリクエストかどうか
 IS_PULL_REQUEST = os.getenv("IS_PULL_REQUEST") == "true"
 
+# 全年度の出場者世界地図をバックグラウンドで事前作成
+if app.config["PREGENERATE_MAPS"]:
+    start_map_pregeneration()
+
 
 ####################################################################
 # MARK: 共通変数
@@ -144,6 +183,35 @@ def set_request_data():
         session["language"] = best_match if best_match else "ja"
 
 
+@app.before_request
+def send_exported_page():
+    """
+    リクエストごとに実行される関数。
+    書き出したページがあり最新の場合は、ビュー関数で描画せずにそのファイルを返します。
+    （言語を使うため、set_request_dataの後に実行されます）
+
+    Returns:
+        Response | None: 書き出したページ。ない場合はNone（通常どおり描画）。
+    """
+    return static_export.send_page()
+
+
+@app.after_request
+def compress_response(response):
+    """
+    リクエストごとに実行される関数。
+    クライアントが対応している場合、レスポンスをbr/gzipで圧縮します。
+    静的ファイルは事前に圧縮したファイルがあればそれを返します。
+
+    Args:
+        response (Response): レスポンス
+
+    Returns:
+        Response: 圧縮した、または元のレスポンス
+    """
+    return response_compressor.compress_response(response)
+
+
 @app.context_processor
 def inject_variables():
     """
@@ -273,36 +341,87 @@ def route_top():
 ####################################################################
 @app.route("/<int:year>/world_map")
 @validate_year
+@page_cache.cached
 def world_map(year: int):
+    """
+    指定された年度の出場者の世界地図を表示します。
+    地図は全年度・全言語で共通のページで、マーカーはJSONから描画します。
+
+    Args:
+        year (int): 表示する年度
+
+    Returns:
+        Response: 世界地図のHTMLテンプレート
+    """
+    if year not in PARTICIPANT_YEARS:
+        abort(404)
+
     # 言語のバリデーション
     user_lang = session.get("language", "ja")
     if user_lang not in AVAILABLE_LANGS:
         user_lang = "ja"
 
-    # マップファイルのパスを作成
-    base_path = os.path.join("app", "templates")
-    abs_base_path = os.path.abspath(base_path)
-    map_filename = f"world_map_{user_lang}.html"
-    map_path = os.path.realpath(
-        os.path.normpath(os.path.join(base_path, str(year), map_filename))
-    )
+    return render_template("common/world_map.html", year=year, user_lang=user_lang)
 
-    # base_path からのパストラバーサル防止
-    try:
-        # Ensure map_path is strictly within abs_base_path
-        if os.path.commonpath([abs_base_path, map_path]) != abs_base_path:
-            abort(404)
-    except ValueError:
-        # Handle invalid paths that could cause os.path.commonpath to fail
+
+@app.route("/api/<int:year>/world_map")
+@validate_year
+def world_map_data(year: int):
+    """
+    指定された年度の世界地図のマーカーデータを返します。
+
+    Args:
+        year (int): 取得する年度
+
+    Returns:
+        Response: マーカーデータのJSONレスポンス（ETag付き）
+    """
+    if year not in PARTICIPANT_YEARS:
         abort(404)
 
-    if not os.path.exists(map_path):
-        create_world_map(year=year, user_lang=user_lang)
+    return make_etag_json_response(get_world_map_data(year))
+
 
-    return render_template(f"{year}/world_map_{user_lang}.html")
+@app.route("/api/countries/<string:lang>")
+def country_names(lang: str):
+    """
+    指定された言語の国名の辞書を返します。
+
+    Args:
+        lang (str): 国名の言語
+
+    Returns:
+        Response: {国コード: 国名} のJSONレスポンス（ETag付き）
+    """
+    if lang not in AVAILABLE_LANGS:
+        abort(404)
+
+    return make_etag_json_response(get_country_names(lang))
+
+
+def make_etag_json_response(data):
+    """
+    ETag付きのJSONレスポンスを作成します。
+    クライアントのETagと一致する場合は304を返します。
+
+    Args:
+        data: JSONに変換するデータ
+
+    Returns:
+        Response: JSONレスポンス
+    """
+    response = jsonify(data)
+    response.add_etag()
+
+    # キャッシュは保持しつつ、毎回ETagで検証させる
+    response.cache_control.public = True
+    response.cache_control.no_cache = True
+
+    return response.make_conditional(request)
 
 
 @app.route("/others/all_participants_map")
+@page_cache.cached
 def all_participants_map():
     """
     全年度の出場者の世界地図を表示します。
@@ -310,8 +429,8 @@ def all_participants_map():
     Returns:
         Response: 世界地図のHTMLテンプレート
     """
-    # mapを作るために必要な関数
-    _ = total_participant_analysis()
+    # 国別出場者数が変わった場合のみ地図を作り直す
+    build_all_participants_map(get_country_counts_all())
 
     return render_template("others/all_participants_map.html")
 
@@ -324,6 +443,7 @@ def all_participants_map():
 )
 @app.route("/<int:year>/participants", methods=["GET"])
 @validate_year
+@page_cache.cached
 def participants(year: int):
     """
     指定された年度の出場者一覧を表示します。
@@ -433,6 +553,7 @@ def participants(year: int):
 )
 @app.route("/<int:year>/japan")
 @validate_year
+@page_cache.cached
 def japan(year: int):
     """
     指定された年度の日本代表の出場者一覧を表示します。
@@ -463,6 +584,7 @@ def japan(year: int):
 )
 @app.route("/<int:year>/korea")
 @validate_year
+@page_cache.cached
 def korea(year: int):
     """
     指定された年度の韓国代表の出場者一覧を表示します。
@@ -494,6 +616,7 @@ def korea(year: int):
 )
 @app.route("/<int:year>/result")
 @validate_year
+@page_cache.cached
 def result(year: int):
     """
     結果ページを表示します。
@@ -563,6 +686,7 @@ def result_redirect():
 )
 @app.route("/<int:year>/rule")
 @validate_year
+@page_cache.cached
 def rule(year: int):
     """
     指定された年度のルールを表示します。
@@ -605,6 +729,7 @@ def rule(year: int):
 )
 @app.route("/<int:year>/<string:content>")
 @validate_year
+@page_cache.cached
 def content(year: int, content: str):
     """
     指定された年度とコンテンツのページを表示します。
@@ -636,6 +761,7 @@ def content(year: int, content: str):
     changefreq="never", priority=0.7, url_variables={"content": CONTENT_OTHERS}
 )
 @app.route("/others/<string:content>")
+@page_cache.cached
 def others(content: str):
     """
     その他のページを表示します。
@@ -715,6 +841,29 @@ def search_participants_by_keyword(year: int):
     return jsonify(response_dict)
 
 
+@app.route("/search_participants", methods=["POST"])
+def search_participants_all():
+    """
+    全年度の出場者を検索し、出場した年度・部門・国を返します。
+
+    Returns:
+        Response: 検索結果のJSONレスポンス。
+            キーワードが文字列でない場合は400。
+    """
+    data = request.get_json(silent=True)
+    keyword = data.get("keyword") if isinstance(data, dict) else None
+    if not isinstance(keyword, str):
+        return jsonify({"error": "keyword must be a string"}), 400
+
+    if not keyword:
+        return jsonify([])
+
+    user_lang = session.get("language", "ja")
+    response_list = search_participants_all_years(keyword=keyword, user_lang=user_lang)
+
+    return jsonify(response_list)
+
+
 @app.route("/search_suggestions", methods=["POST"])
 def search_suggestions():
     """
@@ -732,6 +881,7 @@ def search_suggestions():
 # MARK: データで見るGBB (API)
 ####################################################################
 @app.route("/analyze_data/<int:year>")
+@page_cache.cached
 def analyze_data_yearly(year: int):
     """
     データで見るGBBのページを表示します。
@@ -749,7 +899,7 @@ def analyze_data_yearly(year: int):
 
 
 @app.route("/analyze_data/total")
-@cache.cached()
+@page_cache.cached
 def analyze_data_total():
     """
     データで見るGBBのページを表示します。
@@ -762,6 +912,34 @@ def analyze_data_total():
     return jsonify(total_analysis)
 
 
+####################################################################
+# MARK: キャッシュの統計
+####################################################################
+@app.route("/internal/metrics")
+def cache_metrics():
+    """
+    キャッシュの統計を返します。
+    ローカルホストからの直接のアクセスのみ許可し、それ以外は404を返します。
+
+    Returns:
+        Response: 統計のJSONレスポンス。
+            format=prometheus の場合はPrometheusのテキスト形式。
+    """
+    if not is_local_request(request.remote_addr, request.headers):
+        abort(404)
+
+    if request.args.get("format") == "prometheus":
+        response = Response(
+            metrics_registry.to_prometheus(),
+            mimetype="text/plain; version=0.0.4",
+        )
+    else:
+        response = jsonify(metrics_registry.snapshot())
+
+    response.cache_control.no_store = True
+    return response
+
+
 ####################################################################
 # MARK: Sitemap, 認証系
 ####################################################################
@@ -854,6 +1032,24 @@ def apple_touch_icon():
     return send_file("icon_512.png", mimetype="image/png")
 
 
+####################################################################
+# MARK: ハッシュ付きの静的ファイル
+####################################################################
+@app.route("/assets/<path:filename>")
+def assets(filename: str):
+    """
+    内容のハッシュ付きのURLで静的ファイルを返します。
+    URLは内容が変わると変わるため、1年間キャッシュさせます。
+
+    Args:
+        filename (str): ハッシュ付きのファイル名
+
+    Returns:
+        Response: 静的ファイル
+    """
+    return send_asset(filename)
+
+
 ####################################################################
 # MARK: PWS設定
 ####################################################################
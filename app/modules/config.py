@@ -29,6 +29,24 @@ VALID_CANCEL = ["show", "hide", "only_cancelled"]
 JAPAN = 392
 KOREA = 410
 
+# 永続的キャッシュのメモリ内キャッシュの上限（バイト）
+# 超えた分は最も長く使われていないエントリから破棄し、ファイルキャッシュから読み直す
+PERSISTENT_CACHE_MEMORY_BUDGET = int(
+    os.getenv("PERSISTENT_CACHE_MEMORY_BUDGET", str(16 * 1024 * 1024))
+)
+
+# ページキャッシュに保持する最大ページ数（1ページあたり数十KB）
+PAGE_CACHE_MAXSIZE = int(os.getenv("PAGE_CACHE_MAXSIZE", "256"))
+
+# この大きさ（バイト）以上の動的なレスポンスを圧縮する
+COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))
+
+# ETagごとに保持する圧縮済みのレスポンスの最大数
+COMPRESSION_CACHE_MAXSIZE = int(os.getenv("COMPRESSION_CACHE_MAXSIZE", "256"))
+
+# ページの書き出し先（python -m app.modules.optimization.static_export で作成）
+STATIC_EXPORT_DIR = os.getenv("STATIC_EXPORT_DIR", "static-export")
+
 
 def create_safety_settings(threshold):
     """
@@ -59,6 +77,10 @@ class Config:
         CACHE_DEFAULT_TIMEOUT (int): キャッシュのデフォルトタイムアウト。
         DEBUG (bool): デバッグモードの有効/無効。
         TEMPLATES_AUTO_RELOAD (bool): テンプレートの自動リロードの有効/無効。
+        PREGENERATE_MAPS (bool): 起動時に全年度の出場者世界地図をバックグラウンドで事前作成するか。
+        PAGE_CACHE (bool): 描画済みのページをキャッシュするか。
+        ASSET_FINGERPRINT (bool): テンプレートの静的ファイルのURLを、内容のハッシュ付きにするか。
+        STATIC_EXPORT (bool): 書き出したページがある場合、描画せずにそのファイルを返すか。
     """
 
     SECRET_KEY = os.getenv("SECRET_KEY")
@@ -70,6 +92,10 @@ class Config:
     CACHE_DEFAULT_TIMEOUT = 0
     DEBUG = False
     TEMPLATES_AUTO_RELOAD = False
+    PREGENERATE_MAPS = True
+    PAGE_CACHE = True
+    ASSET_FINGERPRINT = True
+    STATIC_EXPORT = True
 
 
 class TestConfig(Config):
@@ -82,9 +108,17 @@ class TestConfig(Config):
         DEBUG (bool): デバッグモードを有効にします。
         TEMPLATES_AUTO_RELOAD (bool): テンプレートの自動リロードを有効にします。
         SECRET_KEY (str): テスト用の秘密鍵を設定します。
+        PREGENERATE_MAPS (bool): 全年度の出場者世界地図の事前作成を無効にします。
+        PAGE_CACHE (bool): テンプレートの編集がすぐに反映されるよう、ページキャッシュを無効にします。
+        ASSET_FINGERPRINT (bool): 静的ファイルの編集がすぐに反映されるよう、ハッシュ付きのURLを無効にします。
+        STATIC_EXPORT (bool): テンプレートの編集がすぐに反映されるよう、書き出したページを使いません。
     """
 
     CACHE_TYPE = "null"
     DEBUG = True
     TEMPLATES_AUTO_RELOAD = True
     SECRET_KEY = "test"
+    PREGENERATE_MAPS = False
+    PAGE_CACHE = False
+    ASSET_FINGERPRINT = False
+    STATIC_EXPORT = False
@@ -8,6 +8,7 @@ from datetime import datetime
 from functools import lru_cache
 
 from app.modules.optimization.cache import persistent_cache
+from app.modules.optimization.metrics import metrics_registry
 
 from ..config import AVAILABLE_YEARS, VALID_TICKET_CLASSES, VALID_CANCEL
 
@@ -28,7 +29,7 @@ def get_current_timestamp():
 def get_template_contents(year: int) -> list:
     """
     指定された年度のテンプレートコンテンツ一覧をキャッシュ機能付きで取得します。
-    rule, world_mapテンプレートは除外されます。
+    rule, world_map（旧形式の言語ごとの地図ファイルを含む）テンプレートは除外されます。
 
     Args:
         year (int): 取得する年度
@@ -42,8 +43,10 @@ def get_template_contents(year: int) -> list:
         contents = os.listdir(templates_dir_path)
         contents = [content.replace(".html", "") for content in contents]
 
-        # rule, world_mapは除外
-        contents = [c for c in contents if c not in ["rule", "world_map"]]
+        # rule, world_map（旧形式の world_map_ja などを含む）は除外
+        contents = [
+            c for c in contents if c != "rule" and not c.startswith("world_map")
+        ]
         return contents
     except OSError:
         return []
@@ -66,6 +69,11 @@ def get_others_templates() -> list:
         return []
 
 
+# lru_cacheの統計を統計レジストリから取得できるよう登録
+metrics_registry.register_lru_cache("template_contents", get_template_contents)
+metrics_registry.register_lru_cache("others_templates", get_others_templates)
+
+
 def is_latest_year(year):
     """
     指定された年度が最新年度または今年であるかを判定します。
@@ -98,12 +106,12 @@ def is_early_access(year):
 
 def is_translated(url, target_lang=None, translated_paths=None):
     """
-    POファイルを読み込んで、指定されたページに翻訳が提供されているかをチェックします。
+    対象言語のPOファイルをもとに、指定されたページに翻訳が提供されているかをチェックします。
 
     Args:
         url (str): ページの内部URL
-        target_lang (str): 対象言語（Noneの場合は現在のセッション言語）
-        translated_paths (set): 翻訳されたパスのセット（Noneの場合は遅延読み込み）
+        target_lang (str): 対象言語（Noneの場合は英語）
+        translated_paths (frozenset): 翻訳されたパスのセット（Noneの場合は対象言語のセットを使用）
 
     Returns:
         bool: 翻訳が提供されている場合True、されていない場合False
@@ -112,9 +120,9 @@ def is_translated(url, target_lang=None, translated_paths=None):
     if target_lang == "ja":
         return True
 
-    # 遅延読み込みで翻訳パスを取得
+    # 対象言語の翻訳パスを取得（起動時に全言語分を読み込み済み）
     if translated_paths is None:
-        translated_paths = persistent_cache.get_translated_paths()
+        translated_paths = persistent_cache.get_translated_paths(target_lang or "en")
 
     return url in translated_paths
 
@@ -244,3 +252,20 @@ def create_valid_params(category, ticket_class, cancel, valid_categories):
     cancel = cancel if cancel in VALID_CANCEL else "show"
 
     return category, ticket_class, cancel
+
+
+def is_local_request(remote_addr: str, headers) -> bool:
+    """
+    ローカルホストから直接送られたリクエストか判定します。
+    プロキシを経由したリクエスト（X-Forwarded-Forあり）はローカルとみなしません。
+
+    Args:
+        remote_addr (str): 接続元のアドレス
+        headers: リクエストヘッダー
+
+    Returns:
+        bool: ローカルホストからの直接のリクエストの場合True
+    """
+    if "X-Forwarded-For" in headers or "Forwarded" in headers:
+        return False
+    return remote_addr in ("127.0.0.1", "::1")
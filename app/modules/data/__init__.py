@@ -0,0 +1,4 @@
+"""
+データモジュール
+出場者・国などのデータの読み込みと事前計算済みデータを提供
+"""
@@ -0,0 +1,126 @@
+"""
+国データのレジストリ
+
+このモジュールでは、countries.csvを1回だけ読み込み、
+国コード・座標・言語ごとの国名を辞書で引けるレジストリを提供します。
+国コードから座標・国名、(言語, 国名) から国コードをO(1)で取得できます。
+"""
+
+import os
+
+import pandas as pd
+
+COUNTRIES_CSV_PATH = os.path.join("app", "database", "countries.csv")
+
+# 国名以外のカラム
+NON_NAME_COLUMNS = ("iso_code", "lat", "lon")
+
+
+class CountryRegistry:
+    """
+    国データを管理するクラス。
+
+    Attributes:
+        df (pd.DataFrame): 国データ（出場者データとのマージ用）
+        langs (tuple): 国名が登録されている言語のタプル
+        coordinates (dict): 国コードをキーとした (緯度, 経度)
+        names (dict): 言語をキーとした {国コード: 国名} の辞書
+        iso_codes_by_name (dict): 言語をキーとした {国名: 国コード} の辞書
+    """
+
+    def __init__(self, path: str = COUNTRIES_CSV_PATH):
+        """
+        CountryRegistryクラスのコンストラクタ。
+        国データを読み込み、検索用の辞書を作成します。
+
+        Args:
+            path (str, optional): 国データのCSVのパス
+
+        Returns:
+            None
+        """
+        self.df = pd.read_csv(path)
+
+        iso_codes = self.df["iso_code"].tolist()
+        self.langs = tuple(
+            column for column in self.df.columns if column not in NON_NAME_COLUMNS
+        )
+
+        self.coordinates = dict(
+            zip(iso_codes, zip(self.df["lat"].tolist(), self.df["lon"].tolist()))
+        )
+
+        self.names = {}
+        self.iso_codes_by_name = {}
+        for lang in self.langs:
+            names = self.df[lang].tolist()
+            self.names[lang] = dict(zip(iso_codes, names))
+
+            # 同じ国名が複数ある場合は最初の国コードを使う
+            iso_codes_by_name = {}
+            for iso_code, name in zip(iso_codes, names):
+                iso_codes_by_name.setdefault(name, iso_code)
+            self.iso_codes_by_name[lang] = iso_codes_by_name
+
+    def get_name(self, iso_code: int, user_lang: str = "ja") -> str:
+        """
+        国コードから国名を取得します。
+
+        Args:
+            iso_code (int): 国コード
+            user_lang (str, optional): 国名の言語。デフォルトは日本語。
+
+        Returns:
+            str: 国名
+
+        Raises:
+            KeyError: 国コードまたは言語が登録されていない場合
+        """
+        return self.names[user_lang][iso_code]
+
+    def get_names(self, user_lang: str = "ja") -> dict:
+        """
+        指定された言語の {国コード: 国名} の辞書を取得します。
+
+        Args:
+            user_lang (str, optional): 国名の言語。デフォルトは日本語。
+
+        Returns:
+            dict: {国コード: 国名}
+
+        Raises:
+            KeyError: 言語が登録されていない場合
+        """
+        return self.names[user_lang]
+
+    def get_coordinates(self, iso_code: int) -> tuple:
+        """
+        国コードから座標を取得します。
+
+        Args:
+            iso_code (int): 国コード
+
+        Returns:
+            tuple: (緯度, 経度)
+
+        Raises:
+            KeyError: 国コードが登録されていない場合
+        """
+        return self.coordinates[iso_code]
+
+    def find_iso_code(self, name: str, user_lang: str = "ja"):
+        """
+        国名から国コードを取得します。
+
+        Args:
+            name (str): 国名
+            user_lang (str, optional): 国名の言語。デフォルトは日本語。
+
+        Returns:
+            int | None: 国コード。見つからない場合はNone。
+        """
+        return self.iso_codes_by_name.get(user_lang, {}).get(name)
+
+
+# グローバルインスタンス
+country_registry = CountryRegistry()
@@ -0,0 +1,113 @@
+"""
+出場者フィルター用インデックス
+
+このモジュールでは、年度ごとの出場者データに対するフィルター条件を
+NumPyのブール配列として事前計算したインデックスを提供します。
+"""
+
+import numpy as np
+import pandas as pd
+
+
+class ParticipantFilterIndex:
+    """
+    1年度分の出場者データに対するフィルターインデックス。
+    出場区分・キャンセル状態の判定結果と、部門・国コードごとの行の転置インデックスを保持し、
+    任意のフィルターの組み合わせをブール配列のANDだけで処理します。
+
+    行の並びはマージ済みの出場者データ（全言語共通）と一致します。
+
+    Attributes:
+        num_rows (int): 行数
+        is_wildcard (np.ndarray): 出場区分がWildcardかどうか
+        is_gbb_seed (np.ndarray): GBBでシード権を獲得したかどうか
+        is_cancelled (np.ndarray): キャンセルしたかどうか
+        category_masks (dict): 部門名をキーとした行のブール配列
+        iso_code_masks (dict): 国コードをキーとした行のブール配列
+    """
+
+    def __init__(self, beatboxers_df: pd.DataFrame):
+        """
+        ParticipantFilterIndexクラスのコンストラクタ。
+        マージ済みの出場者データからフィルター用の配列を作成します。
+
+        Args:
+            beatboxers_df (pd.DataFrame): マージ・正規化済みの出場者データ
+
+        Returns:
+            None
+        """
+        self.num_rows = len(beatboxers_df)
+        self.is_wildcard = beatboxers_df["is_wildcard"].to_numpy(dtype=bool)
+        self.is_gbb_seed = beatboxers_df["is_gbb_seed"].to_numpy(dtype=bool)
+        self.is_cancelled = beatboxers_df["is_cancelled"].to_numpy(dtype=bool)
+
+        self.category_masks = self._build_inverted_index(beatboxers_df["category"])
+        self.iso_code_masks = self._build_inverted_index(beatboxers_df["iso_code"])
+
+        # 該当なしの場合に返す配列
+        self._empty_mask = np.zeros(self.num_rows, dtype=bool)
+
+    def _build_inverted_index(self, values: pd.Series) -> dict:
+        """
+        値ごとに、その値を持つ行のブール配列を作成します。
+
+        Args:
+            values (pd.Series): インデックス化する列
+
+        Returns:
+            dict: 値をキーとしたブール配列の辞書
+        """
+        codes, uniques = pd.factorize(values)
+        return {value: codes == i for i, value in enumerate(uniques.tolist())}
+
+    def query(
+        self,
+        category: str,
+        ticket_class: str,
+        cancel: str,
+        GBB: bool = None,
+        iso_code: int = None,
+    ) -> np.ndarray:
+        """
+        フィルター条件に一致する行の位置を取得します。
+
+        Args:
+            category (str): 参加者のカテゴリー。"all"の場合は絞り込まない。
+            ticket_class (str): 出場権の種類。
+            cancel (str, "show", "hide", "only_cancelled"): キャンセルの状態。
+            GBB (bool, optional): GBBでのシード権の有無。
+            iso_code (int, optional): 国コード。
+
+        Returns:
+            np.ndarray: 条件に一致する行の位置（昇順）
+        """
+        mask = np.ones(self.num_rows, dtype=bool)
+
+        # 部門でフィルター
+        if category != "all":
+            mask &= self.category_masks.get(category, self._empty_mask)
+
+        # 出場区分がWildcardの人のみ / シード権の人のみ
+        if ticket_class == "wildcard":
+            mask &= self.is_wildcard
+        elif ticket_class == "seed_right":
+            mask &= ~self.is_wildcard
+
+        # 国コードでフィルター
+        if iso_code is not None:
+            mask &= self.iso_code_masks.get(iso_code, self._empty_mask)
+
+        # GBBでシード権を獲得した人のみ / GBB以外でシード権を獲得した人のみ
+        if GBB is True:
+            mask &= self.is_gbb_seed
+        elif GBB is False:
+            mask &= ~self.is_gbb_seed
+
+        # キャンセルした人のみ / キャンセルした人を非表示
+        if cancel == "only_cancelled":
+            mask &= self.is_cancelled
+        elif cancel == "hide":
+            mask &= ~self.is_cancelled
+
+        return np.flatnonzero(mask)
@@ -0,0 +1,180 @@
+"""
+全年度の出場者名インデックス
+
+このモジュールでは、全年度の出場者CSVをまとめた出場者名のインデックスを提供します。
+個人・チーム名と、チームのメンバー名を1人のアーティストとして扱い、
+どの年度・部門・国で出場したかを1回の検索で取得できます。
+"""
+
+from rapidfuzz import fuzz
+from rapidfuzz.process import extract
+
+# 検索結果の最大件数
+SEARCH_LIMIT = 5
+
+
+class ArtistNameIndex:
+    """
+    全年度の出場者名インデックス。
+    アーティスト名（大文字）をキーに、出場履歴をまとめて保持します。
+
+    Attributes:
+        appearances (dict): アーティスト名をキーとした出場履歴のリスト。
+            出場履歴は year, category, ticket_class, iso_codes, team, is_cancelled を持つ辞書。
+        names (list): 検索候補のアーティスト名のリスト
+        countries (CountryRegistry): 国名の取得に使う国データのレジストリ
+    """
+
+    def __init__(self, frames: dict, countries):
+        """
+        ArtistNameIndexクラスのコンストラクタ。
+        年度ごとのマージ済み出場者データから出場履歴をまとめます。
+
+        Args:
+            frames (dict): 年度をキーとしたマージ・正規化済みの出場者データ
+            countries (CountryRegistry): 国名の取得に使う国データのレジストリ
+
+        Returns:
+            None
+        """
+        self.countries = countries
+        self.appearances = {}
+
+        # (アーティスト名, 年度, 部門, チーム名) -> 出場履歴
+        # 複数の国で登録されている行は1件の出場履歴にまとめる
+        appearance_by_key = {}
+
+        for year in sorted(frames):
+            beatboxers_df = frames[year]
+            records = zip(
+                beatboxers_df["name_upper"].tolist(),
+                beatboxers_df["members_upper"].tolist(),
+                beatboxers_df["category"].tolist(),
+                beatboxers_df["ticket_class"].tolist(),
+                beatboxers_df["iso_code"].tolist(),
+                beatboxers_df["is_cancelled"].tolist(),
+            )
+            for (
+                name,
+                members,
+                category,
+                ticket_class,
+                iso_code,
+                is_cancelled,
+            ) in records:
+                artists = [(name, None)]
+                if members:
+                    artists += [
+                        (member.strip(), name) for member in members.split(", ")
+                    ]
+
+                for artist, team in artists:
+                    # 出場者未定の枠は除外
+                    if not artist or artist.startswith("?"):
+                        continue
+
+                    key = (artist, year, category, team)
+                    appearance = appearance_by_key.get(key)
+                    if appearance is None:
+                        appearance = {
+                            "year": year,
+                            "category": category,
+                            "ticket_class": ticket_class,
+                            "iso_codes": [],
+                            "team": team,
+                            "is_cancelled": is_cancelled,
+                        }
+                        appearance_by_key[key] = appearance
+                        self.appearances.setdefault(artist, []).append(appearance)
+
+                    if iso_code not in appearance["iso_codes"]:
+                        appearance["iso_codes"].append(iso_code)
+
+        self.names = list(self.appearances.keys())
+
+    def get_names(self, years: list = None) -> list:
+        """
+        アーティスト名の一覧を取得します。
+
+        Args:
+            years (list, optional): 対象の年度。Noneの場合は全年度。
+
+        Returns:
+            list: アーティスト名のリスト
+        """
+        if years is None:
+            return list(self.names)
+
+        return [
+            name
+            for name, appearances in self.appearances.items()
+            if any(appearance["year"] in years for appearance in appearances)
+        ]
+
+    def get_artist(self, name: str, user_lang: str = "ja") -> dict:
+        """
+        アーティストの出場履歴を、表示用の形式で取得します。
+
+        Args:
+            name (str): アーティスト名（大文字）
+            user_lang (str, optional): ユーザーの言語。デフォルトは日本語。
+
+        Returns:
+            dict: アーティスト名・出場年度・部門・国と、年度ごとの出場履歴
+        """
+        appearances = []
+        years = []
+        categories = []
+        countries = []
+
+        for appearance in self.appearances[name]:
+            appearance_countries = [
+                self.countries.get_name(iso_code, user_lang)
+                for iso_code in appearance["iso_codes"]
+            ]
+            appearances.append(
+                {
+                    "year": appearance["year"],
+                    "category": appearance["category"],
+                    "ticket_class": appearance["ticket_class"],
+                    "country": ", ".join(appearance_countries),
+                    "team": appearance["team"],
+                    "is_cancelled": appearance["is_cancelled"],
+                }
+            )
+
+            if appearance["year"] not in years:
+                years.append(appearance["year"])
+            if appearance["category"] not in categories:
+                categories.append(appearance["category"])
+            for country in appearance_countries:
+                if country not in countries and country != "-":
+                    countries.append(country)
+
+        return {
+            "name": name,
+            "years": years,
+            "categories": categories,
+            "countries": countries,
+            "appearances": appearances,
+        }
+
+    def search(self, keyword: str, user_lang: str = "ja") -> list:
+        """
+        キーワードに類似するアーティストを全年度から検索します。
+
+        Args:
+            keyword (str): 検索するキーワード
+            user_lang (str, optional): ユーザーの言語。デフォルトは日本語。
+
+        Returns:
+            list: 類似度が高い順のアーティストの出場履歴（最大5件）
+        """
+        results = extract(
+            keyword.strip().upper(),
+            self.names,
+            scorer=fuzz.WRatio,
+            limit=SEARCH_LIMIT,
+            score_cutoff=1,
+        )
+        return [self.get_artist(name, user_lang) for name, _, _ in results]
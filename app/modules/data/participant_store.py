@@ -0,0 +1,443 @@
+"""
+出場者データストア
+
+このモジュールでは、年度・言語ごとに国データとマージ・検証・正規化済みの
+出場者データを保持するストアを提供します。
+マージ処理はプロセスごとに1回のみ行われ、以降のリクエストでは再利用されます。
+出場者CSVが更新された場合は、該当年度のデータのみ読み込み直します。
+"""
+
+import hashlib
+import io
+import os
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from ..config import AVAILABLE_YEARS
+from .country_registry import country_registry
+from .filter_index import ParticipantFilterIndex
+from .name_index import ArtistNameIndex
+
+# 出場者データが存在する年度（2022年度は大会中止のためデータなし）
+PARTICIPANT_YEARS = [
+    year for year in AVAILABLE_YEARS + [2013, 2014, 2015, 2016] if year != 2022
+]
+
+PARTICIPANTS_DIR = os.path.join("app", "database", "participants")
+
+# CSVの更新確認の最短間隔（秒）
+VERSION_CHECK_INTERVAL = 1.0
+
+
+def get_file_signature(path: str) -> tuple:
+    """
+    ファイルの更新日時とサイズから、内容の変化を検出するための署名を作成します。
+
+    Args:
+        path (str): ファイルのパス
+
+    Returns:
+        tuple: (更新日時[ns], サイズ)。ファイルが存在しない場合は (0, 0)。
+    """
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return (0, 0)
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+class ParticipantYearData:
+    """
+    1年度分の出場者CSVのDataFrameと、そこから作成したデータを保持するクラス。
+    CSVが更新された場合はインスタンスごと置き換えるため、
+    同じインスタンスから取得したマージ済みデータとフィルターインデックスは常に対応します。
+
+    Attributes:
+        beatboxers_df (pd.DataFrame): 出場者CSVのDataFrame（国データとのマージ前）
+        frames (dict): 言語をキーとしたマージ済みDataFrame
+        filter_index (ParticipantFilterIndex): フィルターインデックス
+    """
+
+    def __init__(self, beatboxers_df: pd.DataFrame):
+        """
+        ParticipantYearDataクラスのコンストラクタ。
+
+        Args:
+            beatboxers_df (pd.DataFrame): 出場者CSVのDataFrame
+
+        Returns:
+            None
+        """
+        self.beatboxers_df = beatboxers_df
+        self.frames = {}
+        self.filter_index = None
+
+
+class ParticipantStore:
+    """
+    年度・言語ごとの出場者データを管理するクラス。
+    国データとのマージ、NaNの検証、表示用の派生カラムの作成を
+    (year, user_lang) ごとに1回だけ行い、結果を保持します。
+
+    Attributes:
+        year_data (dict): 年度をキーとしたParticipantYearData。
+            更新時は辞書ごと1回の代入で置き換えます。
+        name_index (ArtistNameIndex): 全年度の出場者名インデックス
+        file_signatures (dict): 年度をキーとした出場者CSVの署名
+        content_hashes (dict): 年度をキーとした出場者CSVの内容のハッシュ
+        data_version (str): 全年度の出場者CSVの署名から作成したバージョン文字列
+    """
+
+    def __init__(self):
+        """
+        ParticipantStoreクラスのコンストラクタ。
+        全年度の出場者CSVを読み込みます。
+
+        Returns:
+            None
+        """
+        self.file_signatures = {}
+        self.content_hashes = {}
+        self.year_data = {year: self._load_year(year) for year in PARTICIPANT_YEARS}
+
+        self.name_index = None
+        self.data_version = self._compute_data_version()
+        self._last_checked = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _load_year(self, year: int) -> ParticipantYearData:
+        """
+        指定された年度の出場者CSVを読み込み、署名と内容のハッシュを記録します。
+
+        Args:
+            year (int): 出場者の年度
+
+        Returns:
+            ParticipantYearData: 読み込んだ年度のデータ
+        """
+        participants_csv_path = os.path.join(PARTICIPANTS_DIR, f"{year}.csv")
+        self.file_signatures[year] = get_file_signature(participants_csv_path)
+
+        with open(participants_csv_path, "rb") as f:
+            content = f.read()
+        self.content_hashes[year] = hashlib.md5(content).hexdigest()
+
+        beatboxers_df = pd.read_csv(io.BytesIO(content))
+        beatboxers_df = beatboxers_df.fillna("")
+        return ParticipantYearData(beatboxers_df)
+
+    def _compute_data_version(self) -> str:
+        """
+        全年度の出場者CSVの署名からバージョン文字列を作成します。
+
+        Returns:
+            str: バージョン文字列
+        """
+        signatures = repr(sorted(self.file_signatures.items()))
+        return hashlib.md5(signatures.encode("utf-8")).hexdigest()[:12]
+
+    def refresh(self, force: bool = False) -> str:
+        """
+        出場者CSVが更新されていないか確認し、更新された年度のデータを読み込み直します。
+        確認はVERSION_CHECK_INTERVAL秒に1回までに制限されます。
+
+        Args:
+            force (bool, optional): Trueの場合、間隔に関係なく確認します。
+
+        Returns:
+            str: 確認後のデータバージョン
+        """
+        now = time.monotonic()
+        if not force and now - self._last_checked < VERSION_CHECK_INTERVAL:
+            return self.data_version
+
+        with self._lock:
+            self._last_checked = now
+
+            year_data = dict(self.year_data)
+            updated = False
+            for year in PARTICIPANT_YEARS:
+                participants_csv_path = os.path.join(PARTICIPANTS_DIR, f"{year}.csv")
+                signature = get_file_signature(participants_csv_path)
+                if signature == self.file_signatures.get(year):
+                    continue
+
+                # 更新された年度のみ読み込み直す（派生データは新しいインスタンスで作り直す）
+                print(f"出場者データを再読み込み: {year}", flush=True)
+                year_data[year] = self._load_year(year)
+                updated = True
+
+            if updated:
+                # 読み取り中のスレッドが新旧のデータを混ぜないよう、1回の代入で置き換える
+                self.year_data = year_data
+                self.name_index = None
+
+            self.data_version = self._compute_data_version()
+
+        return self.data_version
+
+    def get_data_version(self) -> str:
+        """
+        現在のデータバージョンを取得します。
+        必要に応じてCSVの更新確認を行います。
+
+        Returns:
+            str: データバージョン
+        """
+        return self.refresh()
+
+    def get_beatboxers_df(self, year: int) -> pd.DataFrame:
+        """
+        指定された年度の出場者CSVのDataFrameを取得します（国データとのマージ前）。
+
+        Args:
+            year (int): 出場者の年度
+
+        Returns:
+            pd.DataFrame: 出場者CSVのDataFrame。データがない年度の場合は空のDataFrame。
+        """
+        self.refresh()
+        year_data = self.year_data.get(year)
+        if year_data is None:
+            return pd.DataFrame()
+        return year_data.beatboxers_df
+
+    def get_categories(self, year: int) -> list:
+        """
+        指定された年度の出場者の部門一覧を取得します（CSVでの出現順）。
+
+        Args:
+            year (int): 出場者の年度
+
+        Returns:
+            list: 部門名のリスト。データがない年度の場合は空のリスト。
+        """
+        beatboxers_df = self.get_beatboxers_df(year)
+        if beatboxers_df.empty:
+            return []
+        return beatboxers_df["category"].unique().tolist()
+
+    def _get_frame(
+        self, year_data: ParticipantYearData, user_lang: str
+    ) -> pd.DataFrame:
+        """
+        年度のデータから、指定された言語のマージ済みデータを取得します。
+        初回アクセス時のみ作成し、以降は保持しているデータを返します。
+
+        Args:
+            year_data (ParticipantYearData): 年度のデータ
+            user_lang (str): ユーザーの言語
+
+        Returns:
+            pd.DataFrame: マージ済みの出場者データ
+        """
+        frame = year_data.frames.get(user_lang)
+        if frame is not None:
+            return frame
+
+        with self._lock:
+            # ロック待ちの間に他のスレッドが作成済みの場合はそれを返す
+            frame = year_data.frames.get(user_lang)
+            if frame is None:
+                frame = self._build_frame(year_data.beatboxers_df, user_lang)
+                year_data.frames[user_lang] = frame
+
+        return frame
+
+    def _get_filter_index(self, year_data: ParticipantYearData):
+        """
+        年度のデータから、フィルターインデックスを取得します。
+        行の並びは全言語で共通のため、年度ごとに1つだけ作成します。
+
+        Args:
+            year_data (ParticipantYearData): 年度のデータ
+
+        Returns:
+            ParticipantFilterIndex: フィルターインデックス
+        """
+        filter_index = year_data.filter_index
+        if filter_index is not None:
+            return filter_index
+
+        frame = self._get_frame(year_data, "ja")
+        with self._lock:
+            filter_index = year_data.filter_index
+            if filter_index is None:
+                filter_index = ParticipantFilterIndex(frame)
+                year_data.filter_index = filter_index
+
+        return filter_index
+
+    def get_frame(self, year: int, user_lang: str = "ja") -> pd.DataFrame:
+        """
+        指定された年度・言語のマージ済み出場者データを取得します。
+        初回アクセス時のみ作成し、以降は保持しているデータを返します。
+
+        Args:
+            year (int): 出場者の年度
+            user_lang (str, optional): ユーザーの言語。デフォルトは日本語。
+
+        Returns:
+            pd.DataFrame: マージ済みの出場者データ。
+                呼び出し側で変更しないでください。
+        """
+        return self._get_frame(self.year_data[year], user_lang)
+
+    def get_filter_index(self, year: int) -> ParticipantFilterIndex:
+        """
+        指定された年度のフィルターインデックスを取得します。
+
+        Args:
+            year (int): 出場者の年度
+
+        Returns:
+            ParticipantFilterIndex: フィルターインデックス
+        """
+        return self._get_filter_index(self.year_data[year])
+
+    def get_frame_and_filter_index(self, year: int, user_lang: str = "ja") -> tuple:
+        """
+        指定された年度・言語のマージ済み出場者データと、対応するフィルターインデックスを取得します。
+        同じ時点の年度のデータから取得するため、途中でCSVが更新されても行数が一致します。
+
+        Args:
+            year (int): 出場者の年度
+            user_lang (str, optional): ユーザーの言語。デフォルトは日本語。
+
+        Returns:
+            tuple: (マージ済みの出場者データ, フィルターインデックス)
+        """
+        year_data = self.year_data[year]
+        return (
+            self._get_frame(year_data, user_lang),
+            self._get_filter_index(year_data),
+        )
+
+    def get_name_index(self) -> ArtistNameIndex:
+        """
+        全年度の出場者名インデックスを取得します。
+
+        Returns:
+            ArtistNameIndex: 全年度の出場者名インデックス
+        """
+        name_index = self.name_index
+        if name_index is not None:
+            return name_index
+
+        year_data = self.year_data
+        frames = {
+            year: self._get_frame(year_data[year], "ja") for year in PARTICIPANT_YEARS
+        }
+        name_index = ArtistNameIndex(frames, country_registry)
+
+        with self._lock:
+            # 作成中にCSVが更新された場合は、古いデータのインデックスを保持しない
+            if self.year_data is year_data:
+                self.name_index = name_index
+
+        return name_index
+
+    def _build_frame(self, beatboxers_df: pd.DataFrame, user_lang: str) -> pd.DataFrame:
+        """
+        出場者データと国データをマージし、派生カラムを追加します。
+
+        追加されるカラム:
+            - country: ユーザーの言語での国名
+            - country_en: 英語での国名（国旗画像の参照用）
+            - name_upper: [cancelled] を除去して大文字化した名前
+            - members_upper: 大文字化したメンバー名
+            - is_cancelled: キャンセルしたかどうか
+            - is_wildcard: 出場区分がWildcardかどうか
+            - is_gbb_seed: GBBでシード権を獲得したかどうか
+            - wildcard_rank: Wildcardの順位（Wildcard以外は無限大）
+            - group_id: 名前・部門ごとの番号（複数国で登録された出場者の統合用）
+            - name_order, category_order: 名前・部門の辞書順の番号（ソート用）
+
+        Args:
+            beatboxers_df (pd.DataFrame): 出場者CSVのDataFrame
+            user_lang (str): ユーザーの言語
+
+        Returns:
+            pd.DataFrame: マージ済みの出場者データ
+
+        Raises:
+            ValueError: マージ結果にNaNが含まれている場合
+        """
+        # 国名は英語名と重複しないよう別名で取得
+        countries_df = country_registry.df
+        country_data = pd.DataFrame(
+            {
+                "iso_code": countries_df["iso_code"],
+                "lat": countries_df["lat"],
+                "lon": countries_df["lon"],
+                "country": countries_df[user_lang],
+                "country_en": countries_df["en"],
+            }
+        )
+
+        # 国コードと出場者データをマージ
+        merged_df = beatboxers_df.merge(
+            country_data,
+            on="iso_code",
+            how="left",
+        )
+
+        # マージ結果にNaNが含まれている場合はエラー
+        if merged_df.isnull().any().any():
+            null_columns = merged_df.columns[merged_df.isnull().any()].tolist()
+            null_rows = merged_df[merged_df.isnull().any(axis=1)]
+            error_message = f"Merge operation resulted in NaN values in columns: {null_columns}. Rows with NaN values:\n{null_rows}"
+            raise ValueError(error_message)
+
+        # 表示用の派生カラム
+        names = merged_df["name"].astype(str)
+        ticket_classes = merged_df["ticket_class"].astype(str)
+
+        merged_df["name_upper"] = names.str.replace(
+            "[cancelled] ", "", regex=False
+        ).str.upper()
+        merged_df["members_upper"] = merged_df["members"].astype(str).str.upper()
+        merged_df["is_cancelled"] = names.str.contains("[cancelled]", regex=False)
+        merged_df["is_wildcard"] = ticket_classes.str.startswith("Wildcard")
+        merged_df["is_gbb_seed"] = ticket_classes.str.startswith("GBB")
+
+        # "Wildcard 3" -> 3.0, "Wildcard 2 (2020)" -> 2.0, それ以外 -> inf
+        wildcard_rank = ticket_classes.str.extract(r"^Wildcard (\d+)")[0]
+        merged_df["wildcard_rank"] = wildcard_rank.astype(float).fillna(np.inf)
+
+        # 統合・ソート用の番号
+        merged_df["group_id"] = merged_df.groupby(
+            ["name_upper", "category"], sort=False
+        ).ngroup()
+        merged_df["name_order"] = pd.factorize(merged_df["name_upper"], sort=True)[0]
+        merged_df["category_order"] = pd.factorize(merged_df["category"], sort=True)[0]
+
+        return merged_df
+
+    def warmup(self, years: list = None, langs: list = None) -> None:
+        """
+        指定された年度・言語のマージ済みデータと、各インデックスを事前に作成します。
+
+        Args:
+            years (list, optional): 対象の年度。デフォルトは全年度。
+            langs (list, optional): 対象の言語。デフォルトは日本語のみ。
+
+        Returns:
+            None
+        """
+        years = PARTICIPANT_YEARS if years is None else years
+        langs = ["ja"] if langs is None else langs
+
+        for year in years:
+            for user_lang in langs:
+                self.get_frame(year, user_lang)
+            self.get_filter_index(year)
+
+        self.get_name_index()
+
+
+# グローバルインスタンス
+participant_store = ParticipantStore()
@@ -0,0 +1,52 @@
+"""
+データレジストリ
+
+このモジュールでは、出場者・大会結果・国データのストアをまとめて提供します。
+CSVの読み込み・正規化・インデックスの作成は各ストアが1回だけ行い、
+アプリケーションの各モジュールはこのレジストリを通じて同じデータを参照します。
+"""
+
+from ..config import AVAILABLE_YEARS
+from .country_registry import country_registry
+from .participant_store import participant_store
+from .result_store import result_store
+
+
+class DataRegistry:
+    """
+    出場者・大会結果・国データのストアをまとめて管理するクラス。
+
+    Attributes:
+        countries (CountryRegistry): 国データ
+        participants (ParticipantStore): 出場者データ
+        results (ResultStore): 大会結果データ
+    """
+
+    def __init__(self):
+        """
+        DataRegistryクラスのコンストラクタ。
+
+        Returns:
+            None
+        """
+        self.countries = country_registry
+        self.participants = participant_store
+        self.results = result_store
+
+    def warmup(self) -> None:
+        """
+        起動時にまとめて事前計算を行います。
+        出場者データは全年度、大会結果は最新2年度のみ読み込みます。
+
+        Returns:
+            None
+        """
+        self.participants.warmup()
+
+        # 最新2年度のみを起動時に読み込み
+        priority_years = sorted(AVAILABLE_YEARS, reverse=True)[:2]
+        self.results.warmup(priority_years)
+
+
+# グローバルインスタンス
+data_registry = DataRegistry()
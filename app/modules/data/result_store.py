@@ -0,0 +1,210 @@
+"""
+大会結果データストア
+
+このモジュールでは、大会結果のCSVを読み込み、表示用の形式に変換した結果を保持するストアを提供します。
+結果は (year, category) ごとに最初に要求された時点で読み込まれ、以降のリクエストでは再利用されます。
+CSVが更新された場合は、該当する結果のみ読み込み直します。
+"""
+
+import os
+import threading
+from collections import defaultdict
+
+import pandas as pd
+
+from ..optimization.query_cache import freeze
+from .participant_store import get_file_signature
+
+RESULT_DIR = os.path.join("app", "database", "result")
+
+# 先頭に表示する部門
+PRIORITY_CATEGORIES = ("Loopstation", "Producer")
+
+
+def parse_result(df: pd.DataFrame) -> tuple:
+    """
+    大会結果のDataFrameを、表示用の形式に変換します。
+
+    Args:
+        df (pd.DataFrame): 大会結果のCSVのDataFrame
+
+    Returns:
+        tuple: 結果の種類と結果の辞書。
+        - 結果の種類: "tournament" または "ranking"。
+        - 結果の辞書: ラウンド名をキーにしたリスト。
+            - トーナメント表の場合: ラウンドごとの勝敗を含む辞書。
+            - ランキング表の場合: ラウンドごとの順位を含む辞書。
+
+    Raises:
+        ValueError: トーナメント表・ランキング表のどちらでもない場合
+    """
+    columns = df.columns.tolist()
+    result_dict = defaultdict(list)
+    rounds = df["round"].tolist() if "round" in columns else []
+
+    # トーナメント表の場合
+    if "win" in columns:
+        # CSV に記載されている名前を大文字に変換
+        wins = df["win"].str.upper().tolist()
+        loses = df["lose"].str.upper().tolist()
+
+        # ラウンド名がキーになっているリストに追加
+        for round_name, win, lose in zip(rounds, wins, loses):
+            result_dict[round_name].append({"win": win, "lose": lose})
+
+        return ("tournament", dict(result_dict))
+
+    # ランキング表の場合
+    elif "rank" in columns:
+        ranks = df["rank"].tolist()
+        names = df["name"].str.upper().tolist()
+
+        for round_name, rank, name in zip(rounds, ranks, names):
+            result_dict[round_name].append({"rank": rank, "name": name})
+
+        return ("ranking", dict(result_dict))
+
+    # それ以外の場合
+    raise ValueError("Invalid CSV file.")
+
+
+class ResultStore:
+    """
+    年度・部門ごとの大会結果を管理するクラス。
+    CSVの読み込みと表示用の形式への変換を (year, category) ごとに1回だけ行い、
+    結果を読み取り専用の形式で保持します。
+
+    Attributes:
+        results (dict): (year, category) をキーとした (CSVの署名, 変換済みの結果)
+        categories (dict): 年度をキーとした (ディレクトリの署名, 部門のタプル)
+    """
+
+    def __init__(self, result_dir: str = RESULT_DIR):
+        """
+        ResultStoreクラスのコンストラクタ。
+        CSVは最初に要求された時点で読み込みます。
+
+        Args:
+            result_dir (str, optional): 大会結果のCSVのディレクトリ
+
+        Returns:
+            None
+        """
+        self.result_dir = result_dir
+        self.results = {}
+        self.categories = {}
+        self._lock = threading.Lock()
+
+    def _get_year_dir(self, year: int):
+        """
+        年度の結果ディレクトリのパスを取得します。
+        結果ディレクトリの外を指すパスは拒否します。
+
+        Args:
+            year (int): 大会の年度
+
+        Returns:
+            str | None: ディレクトリのパス。不正な年度の場合はNone。
+        """
+        base_dir = os.path.realpath(self.result_dir)
+        year_dir = os.path.realpath(os.path.join(base_dir, str(year)))
+        if not year_dir.startswith(base_dir + os.sep):
+            return None
+        return year_dir
+
+    def get_categories(self, year: int) -> tuple:
+        """
+        指定された年度の結果がある部門の一覧を取得します。
+        Loopstation, Producerを先頭に配置します。
+
+        Args:
+            year (int): 大会の年度
+
+        Returns:
+            tuple: 部門名のタプル。結果がない年度の場合は空のタプル。
+        """
+        year_dir = self._get_year_dir(year)
+        if year_dir is None:
+            return ()
+
+        signature = get_file_signature(year_dir)
+        cached = self.categories.get(year)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+
+        try:
+            all_category = [
+                filename.replace(".csv", "") for filename in os.listdir(year_dir)
+            ]
+        except OSError:
+            all_category = []
+
+        # Loopstation, Producerを先頭に
+        all_category.sort(
+            key=lambda x: (x == PRIORITY_CATEGORIES[0], x == PRIORITY_CATEGORIES[1]),
+            reverse=True,
+        )
+        categories = tuple(all_category)
+
+        with self._lock:
+            self.categories[year] = (signature, categories)
+
+        return categories
+
+    def get_result(self, year: int, category: str):
+        """
+        指定された年度・部門の大会結果を取得します。
+        CSVが更新されていない場合は、変換済みの結果を再利用します。
+
+        Args:
+            year (int): 大会の年度
+            category (str): 部門名
+
+        Returns:
+            tuple | None: (結果の種類, 結果の辞書)。読み取り専用。
+                結果がない場合はNone。
+
+        Raises:
+            ValueError: CSVがトーナメント表・ランキング表のどちらでもない場合
+        """
+        # 存在する部門のみ受け付ける（パスの組み立てに使うため）
+        if category not in self.get_categories(year):
+            return None
+
+        result_csv_path = os.path.join(self._get_year_dir(year), f"{category}.csv")
+        signature = get_file_signature(result_csv_path)
+
+        key = (year, category)
+        cached = self.results.get(key)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+
+        try:
+            df = pd.read_csv(result_csv_path)
+        except FileNotFoundError:
+            return None
+
+        result = freeze(parse_result(df))
+
+        with self._lock:
+            self.results[key] = (signature, result)
+
+        return result
+
+    def warmup(self, years: list = None) -> None:
+        """
+        指定された年度の全部門の結果を事前に読み込みます。
+
+        Args:
+            years (list, optional): 読み込む年度。Noneの場合は読み込みません。
+
+        Returns:
+            None
+        """
+        for year in years or []:
+            for category in self.get_categories(year):
+                self.get_result(year, category)
+
+
+# グローバルインスタンス
+result_store = ResultStore()
@@ -0,0 +1,132 @@
+"""
+出場者検索用インデックス
+
+このモジュールでは、年度ごとの出場者名・メンバー名のあいまい検索に使う
+事前計算済みのインデックスを提供します。
+"""
+
+from collections import defaultdict
+
+import numpy as np
+from rapidfuzz import fuzz
+from rapidfuzz.process import cdist
+
+# 名前・メンバー名それぞれの候補から取得する件数
+SEARCH_LIMIT = 5
+
+
+class ParticipantSearchIndex:
+    """
+    1年度分の出場者のあいまい検索インデックス。
+    名前とメンバー名の候補を1つの配列にまとめ、rapidfuzzの1回のバッチ計算で類似度を求めます。
+    候補文字列から該当する出場者への対応も事前に作成するため、検索ごとのリスト走査は不要です。
+
+    Attributes:
+        participants (tuple): 出場者リスト（get_participants_listの結果）
+        choices (list): 名前の候補の後ろにメンバー名の候補を連結した配列
+        num_names (int): choicesのうち名前の候補の数
+        choice_rows (dict): 候補文字列をキーとした、該当する出場者の位置のタプル
+    """
+
+    def __init__(self, participants: tuple):
+        """
+        ParticipantSearchIndexクラスのコンストラクタ。
+        出場者リストから検索候補と対応表を作成します。
+
+        Args:
+            participants (tuple): 出場者リスト（名前・メンバー名は大文字化済み）
+
+        Returns:
+            None
+        """
+        self.participants = participants
+
+        names = [participant["name"] for participant in participants]
+        members = [
+            member.strip()
+            for participant in participants
+            for member in participant["members"].split(", ")
+        ]
+        self.choices = names + members
+        self.num_names = len(names)
+
+        # 候補文字列 -> 出場者の位置
+        # 名前が一致する出場者 -> メンバー欄に候補文字列を含む出場者 の順
+        name_rows = defaultdict(list)
+        for i, name in enumerate(names):
+            name_rows[name].append(i)
+
+        self.choice_rows = {}
+        for choice in set(self.choices):
+            member_rows = [
+                i
+                for i, participant in enumerate(participants)
+                if choice in participant["members"]
+            ]
+            self.choice_rows[choice] = tuple(name_rows.get(choice, []) + member_rows)
+
+    def _top_positions(self, scores: np.ndarray, offset: int) -> list:
+        """
+        類似度の高い順（同点の場合は候補の順）に上位の位置を取得します。
+
+        Args:
+            scores (np.ndarray): 候補ごとの類似度
+            offset (int): choicesにおける先頭の位置
+
+        Returns:
+            list: choicesにおける位置のリスト
+        """
+        positions = np.flatnonzero(scores >= 1)
+        order = np.lexsort((positions, -scores[positions]))[:SEARCH_LIMIT]
+        return (positions[order] + offset).tolist()
+
+    def search(self, keyword: str) -> list:
+        """
+        キーワードに類似する出場者を検索します。
+
+        Args:
+            keyword (str): 検索するキーワード
+
+        Returns:
+            list: 一致した出場者のリスト（最大5件）
+        """
+        if not self.choices:
+            return []
+
+        # 名前・メンバー名の類似度を1回で計算
+        scores = cdist(
+            [keyword.upper()],
+            self.choices,
+            scorer=fuzz.WRatio,
+            score_cutoff=1,
+            dtype=np.float64,
+        )[0]
+
+        # 名前とメンバー名からそれぞれ上位5件を取得
+        top_positions = self._top_positions(
+            scores[: self.num_names], 0
+        ) + self._top_positions(scores[self.num_names :], self.num_names)
+
+        # 名前とmembersの結果を統合（同じ文字列は後の類似度で上書き）
+        combined_results = {}
+        for position in top_positions:
+            combined_results[self.choices[position]] = scores[position]
+
+        # 類似度が高い順に並び替え
+        sorted_results = sorted(
+            combined_results.items(), key=lambda x: x[1], reverse=True
+        )
+
+        # 元の順序を保持しつつ、重複を削除、上位5件を取得
+        final_rows = []
+        seen_rows = set()
+        for choice, _ in sorted_results:
+            for row in self.choice_rows[choice]:
+                if row not in seen_rows:
+                    seen_rows.add(row)
+                    final_rows.append(row)
+
+            if len(final_rows) >= SEARCH_LIMIT:
+                break
+
+        return [self.participants[row] for row in final_rows[:SEARCH_LIMIT]]
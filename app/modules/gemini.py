@@ -5,16 +5,16 @@ import random
 import re
 from threading import Thread
 
-import pandas as pd
 import pykakasi
 from asyncio_throttle import Throttler
-from cachetools import TTLCache
 from google import genai
 from rapidfuzz import process
 
 from . import spreadsheet
 from .config import AVAILABLE_YEARS, create_safety_settings
 from .core.utils import find_others_url
+from .data.participant_store import participant_store
+from .optimization.metrics import MeteredTTLCache, metrics_registry
 from .prompts import get_prompt
 
 API_KEY = os.environ.get("GEMINI_API_KEY")
@@ -51,37 +51,20 @@ with open(cache_file_path, "r", encoding="utf-8") as f:
 cache = {key.upper(): value for key, value in cache.items()}
 
 # 同じ質問が2回来ることがあるので、簡易キャッシュを保存
-last_question_cache = TTLCache(maxsize=100, ttl=60)
-
-# 最新年度と1年前の出場者一覧を読み込む
+last_question_cache_metrics = metrics_registry.register(
+    "last_question_cache",
+    lambda: {
+        "entries": len(last_question_cache),
+        "maxsize": last_question_cache.maxsize,
+    },
+)
+last_question_cache = MeteredTTLCache(
+    maxsize=100, ttl=60, metrics=last_question_cache_metrics
+)
+
+# 最新年度と1年前の出場者名リストを作成（個人出場者・チーム名・メンバー名）
 years_to_consider = sorted(AVAILABLE_YEARS, reverse=True)[:2]
-
-# 出場者名リストを作成
-name_list = []
-for year in years_to_consider:
-    participants_csv_path = os.path.join(
-        os.getcwd(), "app", "database", "participants", f"{year}.csv"
-    )
-    beatboxers_df = pd.read_csv(participants_csv_path)
-    beatboxers_df = beatboxers_df.fillna("")
-
-    # まずは個人出場者・チーム名のリストを読み込む
-    names = (
-        beatboxers_df["name"]
-        .str.replace("[cancelled] ", "", regex=False)
-        .str.upper()
-        .tolist()
-    )
-    name_list.extend(names)
-
-    # 複数名部門メンバーのリストを読み込む
-    team_members_list = beatboxers_df["members"].astype(str).str.upper().tolist()
-    for team_members in team_members_list:
-        if team_members != "":
-            member = team_members.split(", ")
-            name_list.extend(member)
-
-name_list = list(set(name_list))
+name_list = participant_store.get_name_index().get_names(years=years_to_consider)
 
 # 出場者名をキャッシュに追加
 for name in name_list:
@@ -126,8 +109,11 @@ def search_cache(year: int, question: str):
     # 前回の質問と同じ場合はキャッシュを返す
     if question in last_question_cache:
         print("Cache hit", flush=True)
+        last_question_cache_metrics.increment("hits")
         return last_question_cache[question]
 
+    last_question_cache_metrics.increment("misses")
+
     return None
 
 
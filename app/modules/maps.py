@@ -0,0 +1,391 @@
+"""
+世界地図の作成モジュール
+年度ごとの世界地図はマーカーデータをJSONで提供し、共通のページでクライアント側で描画する
+全年度の出場者世界地図はfoliumで作成し、テンプレートとして保存する
+（国別出場者数が変わった場合のみ作り直し、本番環境では起動時にバックグラウンドで事前作成する）
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+
+import folium
+
+from .data.country_registry import country_registry
+from .data.participant_store import participant_store
+from .optimization.assets import asset_manifest
+from .optimization.query_cache import QueryCache
+from .participants import get_country_counts_all
+
+ALL_PARTICIPANTS_MAP_PATH = os.path.join(
+    "app", "templates", "others", "all_participants_map.html"
+)
+
+# 地図の作成処理を変更した場合はこの値を上げ、既存の地図を作り直す
+MAP_BUILD_VERSION = 2
+
+# 国旗画像の静的ファイルのディレクトリ（ファイル名は英語の国名）
+FLAG_IMAGE_DIR = "images/flags/"
+FLAG_ICON_SIZE = (48, 48)
+
+# 地図ファイルの先頭に記録するハッシュのコメント
+CONTENT_HASH_PREFIX = "<!-- content-hash: "
+CONTENT_HASH_SUFFIX = " -->"
+
+# 年度ごとの世界地図のマーカーデータのキャッシュ
+world_map_data_cache = QueryCache("world_map_data", maxsize=64)
+
+# 言語ごとの国名の辞書
+country_names_dict = {}
+
+# 全年度の出場者世界地図の作成を1回にまとめるためのロック
+all_participants_map_lock = threading.Lock()
+
+
+# MARK: 地図ファイルの保存
+def compute_content_hash(data) -> str:
+    """
+    地図の元データから、地図の内容を識別するハッシュを作成します。
+
+    Args:
+        data: JSONに変換できる地図の元データ
+
+    Returns:
+        str: ハッシュ文字列
+    """
+    # 国旗画像のURLは静的ファイルの内容のハッシュを含むため、静的ファイルのバージョンも含める
+    payload = json.dumps(
+        {
+            "version": MAP_BUILD_VERSION,
+            "assets": asset_manifest.get_version(),
+            "data": data,
+        },
+        sort_keys=True,
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def read_content_hash(path: str):
+    """
+    保存済みの地図ファイルの先頭に記録されたハッシュを読み込みます。
+
+    Args:
+        path (str): 地図ファイルのパス
+
+    Returns:
+        str | None: ハッシュ文字列。ファイルがない・記録がない場合はNone。
+    """
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            first_line = f.readline().strip()
+    except OSError:
+        return None
+
+    if first_line.startswith(CONTENT_HASH_PREFIX) and first_line.endswith(
+        CONTENT_HASH_SUFFIX
+    ):
+        return first_line[len(CONTENT_HASH_PREFIX) : -len(CONTENT_HASH_SUFFIX)]
+    return None
+
+
+def save_map(folium_map: folium.Map, path: str, content_hash: str = None) -> None:
+    """
+    foliumの地図をHTMLファイルとして保存します。
+    ハッシュが指定された場合は、ファイルの先頭にコメントとして記録します。
+    同じディレクトリの一時ファイルに書き込んでから置き換えるため、
+    書き込み途中のファイルが読まれることはありません。
+
+    Args:
+        folium_map (folium.Map): 保存する地図
+        path (str): 保存先のパス
+        content_hash (str, optional): 地図の元データのハッシュ
+
+    Returns:
+        None: (ファイルを保存)
+    """
+    html = folium_map.get_root().render()
+    if content_hash is not None:
+        html = f"{CONTENT_HASH_PREFIX}{content_hash}{CONTENT_HASH_SUFFIX}\n{html}"
+
+    directory, filename = os.path.split(path)
+    fd, tmp_path = tempfile.mkstemp(
+        prefix=f".{filename}.", suffix=".tmp", dir=directory
+    )
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(html)
+        # mkstempは所有者のみ読み書き可能なファイルを作るため、通常のテンプレートと同じ権限にする
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+
+
+# MARK: 年度ごとの世界地図 (JSON)
+def build_world_map_markers(year: int) -> list:
+    """
+    指定された年の世界地図のマーカーデータを作成します。
+    言語に依存しないデータのみを含み、国名はget_country_namesで別に取得します。
+
+    Args:
+        year (int): 地図を作成する年。
+
+    Returns:
+        list: 座標ごとのマーカーのリスト。各マーカーは以下のキーを持つ:
+            - lat, lon: 緯度経度
+            - iso_code: 国コード
+            - flag: 国旗画像のファイル名（英語の国名）
+            - flag_url: 国旗画像のURL（内容のハッシュ付き）
+            - teams: チーム数
+            - beatboxers: beatboxer数
+            - participants: [名前, 部門, メンバー] のリスト
+    """
+    # マージ・正規化済みのデータを取得（言語に依存するカラムは使わない）
+    beatboxers_df = participant_store.get_frame(year)
+
+    # キャンセルした人、国コード0の人を削除
+    beatboxers_df = beatboxers_df[
+        ~beatboxers_df["is_cancelled"] & (beatboxers_df["iso_code"] != 0)
+    ]
+
+    # 部門順にソート（2020年のみ、部門・名前順）
+    sort_keys = ["category", "name"] if year == 2020 else ["category"]
+    beatboxers_df = beatboxers_df.sort_values(by=sort_keys, kind="stable")
+
+    markers = []
+    for (lat, lon), group in beatboxers_df.groupby(["lat", "lon"]):
+        names = group["name_upper"].values
+        categories = group["category"].values
+        members = group["members_upper"].values
+
+        # beatboxer数（チームはメンバーごとに数え、重複を削除）
+        unique_beatboxers = set()
+        for name, member_names in zip(names, members):
+            if member_names:
+                unique_beatboxers.update(member_names.split(", "))
+            else:
+                unique_beatboxers.add(name)
+
+        markers.append(
+            {
+                "lat": float(lat),
+                "lon": float(lon),
+                "iso_code": int(group["iso_code"].values[0]),
+                "flag": group["country_en"].values[0],
+                "flag_url": get_flag_url(group["country_en"].values[0]),
+                "teams": len(names),
+                "beatboxers": len(unique_beatboxers),
+                "participants": [
+                    [name, category, member_names]
+                    for name, category, member_names in zip(names, categories, members)
+                ],
+            }
+        )
+
+    return markers
+
+
+def get_world_map_data(year: int) -> dict:
+    """
+    指定された年の世界地図のマーカーデータを取得します。
+    出場者データのバージョンごとにキャッシュされます。
+
+    Args:
+        year (int): 地図の年。
+
+    Returns:
+        dict: 年度とマーカーのリストを含む辞書（読み取り専用）
+    """
+    data_version = participant_store.get_data_version()
+
+    world_map_data = world_map_data_cache.get(year, data_version)
+    if world_map_data is not None:
+        return world_map_data
+
+    world_map_data = {"year": year, "markers": build_world_map_markers(year)}
+    return world_map_data_cache.set(year, data_version, world_map_data)
+
+
+def get_country_names(user_lang: str) -> dict:
+    """
+    国コードをキーとした、指定された言語の国名の辞書を取得します。
+    国コード0（出場者未定）は含みません。
+
+    Args:
+        user_lang (str): ユーザーの言語。
+
+    Returns:
+        dict: {国コード（文字列）: 国名}
+    """
+    country_names = country_names_dict.get(user_lang)
+    if country_names is not None:
+        return country_names
+
+    country_names = {
+        str(iso_code): name
+        for iso_code, name in country_registry.get_names(user_lang).items()
+        if iso_code != 0
+    }
+
+    country_names_dict[user_lang] = country_names
+    return country_names
+
+
+# MARK: 国旗アイコン
+def get_flag_url(country_name_en: str) -> str:
+    """
+    国旗画像の静的ファイルのURLを取得します。
+    内容のハッシュ付きのURLのため、ブラウザにキャッシュされた画像は再検証なしで使われます。
+
+    Args:
+        country_name_en (str): 英語の国名
+
+    Returns:
+        str: 国旗画像のURL
+    """
+    return asset_manifest.get_url(f"{FLAG_IMAGE_DIR}{country_name_en}.webp")
+
+
+def create_flag_icon(country_name_en: str) -> folium.DivIcon:
+    """
+    国旗画像をURLで参照するマーカーのアイコンを作成します。
+    folium.CustomIconはローカルの画像を地図のHTMLに埋め込むため使いません。
+    URLで参照すると、ブラウザは国旗画像を1回だけ取得してキャッシュできます。
+
+    Args:
+        country_name_en (str): 英語の国名
+
+    Returns:
+        folium.DivIcon: 国旗のアイコン
+    """
+    width, height = FLAG_ICON_SIZE
+    return folium.DivIcon(
+        html=f'<img src="{get_flag_url(country_name_en)}" width="{width}" height="{height}" alt="">',
+        icon_size=FLAG_ICON_SIZE,  # アイコンのサイズ（幅、高さ）
+        icon_anchor=(width // 2, height),  # アイコンのアンカー位置
+        class_name="flag-icon",
+    )
+
+
+# MARK: 全年度 出場者世界地図
+def create_all_participants_map(country_counts_all: dict, content_hash: str = None):
+    """
+    全年度の出場者数ランキングを示す世界地図を作成します。
+    なお、言語は日本語固定です。
+
+    Args:
+        country_counts_all (dict): 国別出場者数ランキング。
+        content_hash (str, optional): 地図の元データのハッシュ。ファイルの先頭に記録します。
+
+    Returns:
+        None: (ファイルを保存)
+    """
+    # マップを作成
+    map_center = [20, 0]
+    all_participants_map = folium.Map(
+        tiles="https://server.arcgisonline.com/ArcGIS/rest/services/World_Physical_Map/MapServer/tile/{z}/{y}/{x}",
+        attr="Tiles &copy; Esri &mdash; Source: US National Park Service",
+        location=map_center,
+        zoom_start=2,
+        zoom_control=True,
+        control_scale=True,
+        min_zoom=1,
+        max_zoom=8,
+        max_bounds=True,
+        options={
+            "zoomSnap": 0.1,  # ズームのステップを0.1に設定
+            "zoomDelta": 0.1,  # ズームの増減を0.1に設定
+        },
+    )
+
+    # マーカーを地図に追加
+    for _, data in country_counts_all.items():
+        country_name = data["country"]
+        count = data["count"]
+
+        # 出場者未定はスキップ
+        if country_name == "-":
+            continue
+
+        # 国の情報を取得
+        iso_code = country_registry.find_iso_code(country_name, "ja")
+        country_name_en = country_registry.get_name(iso_code, "en")
+
+        # 経度、緯度
+        location = country_registry.get_coordinates(iso_code)
+
+        # ポップアップコンテンツを作成
+        popup_content = f"""
+        <div style="font-family: 'Noto Sans JP', sans-serif; font-size: 14px;">
+            <h3 style="margin: 0; color: #ff6417;">{country_name}</h3>
+            <p style="margin: 5px 0;">{count} team(s)</p>
+        </div>
+        """
+
+        # ポップアップを作成
+        popup = folium.Popup(popup_content, max_width=1000)
+
+        # マーカーを追加
+        folium.Marker(
+            location=location,
+            popup=popup,
+            tooltip=country_name,
+            icon=create_flag_icon(country_name_en),
+        ).add_to(all_participants_map)
+
+    save_map(all_participants_map, ALL_PARTICIPANTS_MAP_PATH, content_hash)
+
+
+def build_all_participants_map(country_counts_all: dict) -> bool:
+    """
+    全年度の出場者世界地図を、元データが変わった場合のみ作り直します。
+    保存済みの地図に記録されたハッシュと、国別出場者数のハッシュを比較します。
+    同時に複数のリクエストから呼ばれた場合も、作成は1回だけ行います。
+
+    Args:
+        country_counts_all (dict): 国別出場者数ランキング。
+
+    Returns:
+        bool: 地図を作り直した場合はTrue、既存の地図を使う場合はFalse
+    """
+    content_hash = compute_content_hash(country_counts_all)
+    if read_content_hash(ALL_PARTICIPANTS_MAP_PATH) == content_hash:
+        return False
+
+    with all_participants_map_lock:
+        # ロック待ちの間に他のスレッドが作成済みの場合は何もしない
+        if read_content_hash(ALL_PARTICIPANTS_MAP_PATH) == content_hash:
+            return False
+
+        create_all_participants_map(country_counts_all, content_hash)
+        return True
+
+
+def pregenerate_all_participants_map() -> None:
+    """
+    全年度の出場者世界地図を事前作成します。失敗した場合はリクエスト時に作成されます。
+
+    Returns:
+        None
+    """
+    try:
+        built = build_all_participants_map(get_country_counts_all())
+    except Exception as e:
+        print(f"地図の事前作成エラー: {e}", flush=True)
+        return
+
+    print(f"地図の事前作成が完了しました（{int(built)}件作成）", flush=True)
+
+
+def start_map_pregeneration() -> None:
+    """
+    全年度の出場者世界地図の事前作成をバックグラウンドのスレッドで開始します。
+
+    Returns:
+        None
+    """
+    threading.Thread(target=pregenerate_all_participants_map, daemon=True).start()
@@ -0,0 +1,347 @@
+"""
+静的ファイルのフィンガープリントモジュール
+静的ファイルの内容のハッシュを含むURL（/assets/css/base.1a2b3c4d5e.css など）の一覧を作成し、
+テンプレートのurl_for('static', ...)からそのURLを出力する
+一覧は設定のASSET_FINGERPRINTが有効な場合のみ、最初に使われた時に作成する
+ハッシュ付きのURLは内容が変わらないため、ブラウザに1年間キャッシュさせる
+"""
+
+import hashlib
+import mimetypes
+import os
+import re
+import threading
+import time
+from urllib.parse import quote
+
+from flask import abort, current_app, request, send_from_directory, url_for
+
+from ..data.participant_store import VERSION_CHECK_INTERVAL, get_file_signature
+
+STATIC_DIR = os.path.join("app", "static")
+
+# ハッシュ付きのURLの接頭辞
+ASSET_URL_PREFIX = "/assets/"
+
+# ハッシュ付きのURLのキャッシュ期間（秒）
+ASSET_MAX_AGE = 365 * 24 * 60 * 60
+
+# 一覧に含めないファイル（事前圧縮したファイル、一時ファイル）
+EXCLUDED_EXTENSIONS = (".br", ".gz", ".tmp")
+
+# 中の /static/ のURLをハッシュ付きのURLに書き換えるファイル
+REWRITE_EXTENSIONS = (".css",)
+
+# CSS内の url(/static/...) を探す正規表現
+STATIC_URL_PATTERN = re.compile(r"""url\((['"]?)/static/([^'")]+)\1\)""")
+
+
+def get_hashed_url(filename: str, hashed_name: str = None) -> str:
+    """
+    静的ファイルのURLを作成します（アプリケーションコンテキストは不要）。
+
+    Args:
+        filename (str): 静的ファイルのディレクトリからの相対パス
+        hashed_name (str, optional): ハッシュ付きのファイル名
+
+    Returns:
+        str: ハッシュ付きのURL。hashed_nameがNoneの場合は /static/ のURL。
+    """
+    if hashed_name is None:
+        return f"/static/{quote(filename)}"
+    return f"{ASSET_URL_PREFIX}{quote(hashed_name)}"
+
+
+class AssetManifest:
+    """
+    静的ファイルとハッシュ付きのファイル名の対応を管理するクラス。
+    CSSは中の画像のURLもハッシュ付きに書き換えるため、書き換えた内容からハッシュを作成し、
+    書き換えた内容をメモリに保持します。
+    一覧は有効な場合のみ最初に使われた時に作成し、静的ファイルが変わった場合は作り直します。
+
+    Attributes:
+        static_folder (str): 静的ファイルのディレクトリ
+        enabled (bool): ハッシュ付きのURLを使うか（init_appで設定のASSET_FINGERPRINTから設定）
+        hashed_names (dict): 元のファイル名をキーとしたハッシュ付きのファイル名
+        source_names (dict): ハッシュ付きのファイル名をキーとした元のファイル名
+        contents (dict): ハッシュ付きのファイル名をキーとした書き換え後の内容（CSSのみ）
+        version (str): 全ファイルのハッシュから作成したバージョン文字列
+        files_signature (str): 一覧を作成した時の全ファイルの署名から作成した文字列
+    """
+
+    def __init__(self, static_folder: str = STATIC_DIR):
+        """
+        AssetManifestクラスのコンストラクタ。
+        一覧はここでは作成せず、最初に使われた時に作成します。
+
+        Args:
+            static_folder (str, optional): 静的ファイルのディレクトリ
+
+        Returns:
+            None
+        """
+        self.static_folder = static_folder
+        self.enabled = False
+        self.hashed_names = {}
+        self.source_names = {}
+        self.contents = {}
+        self.version = None
+        self.files_signature = None
+        self._last_checked = 0.0
+        self._lock = threading.Lock()
+
+    def init_app(self, app) -> None:
+        """
+        アプリケーションの設定のASSET_FINGERPRINTから、ハッシュ付きのURLを使うかを設定します。
+
+        Args:
+            app (Flask): Flaskアプリケーション
+
+        Returns:
+            None
+        """
+        self.enabled = bool(app.config.get("ASSET_FINGERPRINT"))
+
+    def _list_files(self) -> list:
+        """
+        一覧に含める静的ファイルのファイル名（静的ファイルのディレクトリからの相対パス）を取得します。
+
+        Returns:
+            list: ファイル名のリスト
+        """
+        filenames = []
+        for root, dirs, files in os.walk(self.static_folder):
+            dirs.sort()
+            for filename in sorted(files):
+                if filename.startswith(".") or filename.endswith(EXCLUDED_EXTENSIONS):
+                    continue
+                path = os.path.join(root, filename)
+                relative_path = os.path.relpath(path, self.static_folder)
+                filenames.append(relative_path.replace(os.sep, "/"))
+        return filenames
+
+    def _compute_files_signature(self) -> str:
+        """
+        一覧に含める全ファイルの署名から文字列を作成します。
+        ファイルの更新日時とサイズのみを使うため、内容は読みません。
+
+        Returns:
+            str: ファイルの追加・削除・更新のいずれでも変わる文字列
+        """
+        signatures = [
+            (filename, get_file_signature(os.path.join(self.static_folder, filename)))
+            for filename in self._list_files()
+        ]
+        return hashlib.md5(repr(signatures).encode("utf-8")).hexdigest()[:12]
+
+    def _add(
+        self, filename: str, content: bytes, hashed_names: dict, source_names: dict
+    ) -> str:
+        """
+        内容のハッシュからハッシュ付きのファイル名を作成し、一覧に追加します。
+
+        Args:
+            filename (str): 元のファイル名
+            content (bytes): ファイルの内容
+            hashed_names (dict): 追加先の、元のファイル名をキーとした一覧
+            source_names (dict): 追加先の、ハッシュ付きのファイル名をキーとした一覧
+
+        Returns:
+            str: ハッシュ付きのファイル名
+        """
+        digest = hashlib.md5(content).hexdigest()[:10]
+        name, extension = os.path.splitext(filename)
+        hashed_name = f"{name}.{digest}{extension}"
+
+        hashed_names[filename] = hashed_name
+        source_names[hashed_name] = filename
+        return hashed_name
+
+    def _rewrite_static_urls(self, content: bytes, hashed_names: dict) -> bytes:
+        """
+        CSS内の url(/static/...) を、一覧にあるファイルはハッシュ付きのURLに書き換えます。
+
+        Args:
+            content (bytes): CSSの内容
+            hashed_names (dict): 元のファイル名をキーとしたハッシュ付きのファイル名
+
+        Returns:
+            bytes: 書き換えた内容
+        """
+
+        def replace(match):
+            quote_char, filename = match.groups()
+            url = get_hashed_url(filename, hashed_names.get(filename))
+            return f"url({quote_char}{url}{quote_char})"
+
+        text = content.decode("utf-8")
+        return STATIC_URL_PATTERN.sub(replace, text).encode("utf-8")
+
+    def build(self) -> None:
+        """
+        静的ファイルを読み込み、ハッシュ付きのファイル名の一覧を作り直します。
+        CSSは参照する画像のハッシュが決まった後に書き換えて追加します。
+        作成中も以前の一覧を使えるよう、作成し終えてから置き換えます。
+
+        Returns:
+            None
+        """
+        hashed_names = {}
+        source_names = {}
+        contents = {}
+
+        filenames = self._list_files()
+        rewrite_filenames = [f for f in filenames if f.endswith(REWRITE_EXTENSIONS)]
+
+        for filename in filenames:
+            if filename in rewrite_filenames:
+                continue
+            with open(os.path.join(self.static_folder, filename), "rb") as f:
+                self._add(filename, f.read(), hashed_names, source_names)
+
+        for filename in rewrite_filenames:
+            with open(os.path.join(self.static_folder, filename), "rb") as f:
+                content = self._rewrite_static_urls(f.read(), hashed_names)
+            contents[self._add(filename, content, hashed_names, source_names)] = content
+
+        digests = repr(sorted(hashed_names.items()))
+        self.hashed_names = hashed_names
+        self.source_names = source_names
+        self.contents = contents
+        self.version = hashlib.md5(digests.encode("utf-8")).hexdigest()[:12]
+
+    def refresh(self, force: bool = False) -> bool:
+        """
+        一覧を最初に使われた時に作成し、以降は静的ファイルが変わった場合のみ作り直します。
+        ファイルの確認はVERSION_CHECK_INTERVAL秒に1回までに制限されます。
+        無効な場合は何もしません。
+
+        Args:
+            force (bool, optional): Trueの場合、間隔に関係なくファイルを確認します。
+
+        Returns:
+            bool: 一覧を使える（有効な）場合True
+        """
+        if not self.enabled:
+            return False
+
+        now = time.monotonic()
+        if (
+            force
+            or self.version is None
+            or now - self._last_checked >= VERSION_CHECK_INTERVAL
+        ):
+            with self._lock:
+                self._last_checked = now
+                # 作成中の変更を見逃さないよう、署名はファイルを読む前に取得する
+                signature = self._compute_files_signature()
+                if signature != self.files_signature:
+                    self.build()
+                    self.files_signature = signature
+        return True
+
+    def get_version(self):
+        """
+        全ファイルのハッシュから作成したバージョン文字列を取得します。
+
+        Returns:
+            str | None: バージョン文字列。無効な場合はNone。
+        """
+        if not self.refresh():
+            return None
+        return self.version
+
+    def get_url(self, filename: str) -> str:
+        """
+        静的ファイルのURLを取得します（アプリケーションコンテキストは不要）。
+
+        Args:
+            filename (str): 静的ファイルのディレクトリからの相対パス
+
+        Returns:
+            str: ハッシュ付きのURL。無効な場合、または一覧にないファイルの場合は /static/ のURL。
+        """
+        hashed_name = self.hashed_names.get(filename) if self.refresh() else None
+        return get_hashed_url(filename, hashed_name)
+
+    def get_source_name(self, hashed_name: str):
+        """
+        ハッシュ付きのファイル名から、内容がファイルと同じ元のファイル名を取得します。
+        書き換えたCSSは内容がファイルと異なるため、Noneを返します。
+
+        Args:
+            hashed_name (str): ハッシュ付きのファイル名
+
+        Returns:
+            str | None: 元のファイル名。無効な場合、または一覧にない・書き換えたファイルの場合はNone。
+        """
+        if not self.refresh() or hashed_name in self.contents:
+            return None
+        return self.source_names.get(hashed_name)
+
+
+def asset_url_for(endpoint: str, **values) -> str:
+    """
+    url_forと同じ引数で使えるテンプレート用の関数。
+    url_for('static', filename=...) の場合は、ハッシュ付きのURLを返します。
+    設定のASSET_FINGERPRINTが無効、または一覧にないファイルの場合は通常のURLを返します。
+
+    Args:
+        endpoint (str): エンドポイント名
+        **values: url_forに渡す引数
+
+    Returns:
+        str: URL
+    """
+    if (
+        endpoint == "static"
+        and current_app.config.get("ASSET_FINGERPRINT")
+        and set(values) == {"filename"}
+        and asset_manifest.refresh()
+    ):
+        hashed_name = asset_manifest.hashed_names.get(values["filename"])
+        if hashed_name is not None:
+            return url_for("assets", filename=hashed_name)
+
+    return url_for(endpoint, **values)
+
+
+def send_asset(hashed_name: str):
+    """
+    ハッシュ付きのURLの静的ファイルを返します。
+    内容が変わるとURLも変わるため、1年間変更されないものとしてキャッシュさせます。
+
+    Args:
+        hashed_name (str): ハッシュ付きのファイル名
+
+    Returns:
+        Response: 静的ファイルのレスポンス
+    """
+    if not asset_manifest.refresh():
+        abort(404)
+
+    filename = asset_manifest.source_names.get(hashed_name)
+    if filename is None:
+        abort(404)
+
+    content = asset_manifest.contents.get(hashed_name)
+    if content is not None:
+        mimetype, _ = mimetypes.guess_type(filename)
+        response = current_app.response_class(content, mimetype=mimetype)
+        response.set_etag(hashed_name)
+        # send_from_directoryと同様に、ETagが一致する場合は304を返す
+        response.make_conditional(request)
+    else:
+        response = send_from_directory(
+            os.path.abspath(asset_manifest.static_folder), filename
+        )
+
+    response.cache_control.public = True
+    response.cache_control.no_cache = None
+    response.cache_control.max_age = ASSET_MAX_AGE
+    response.cache_control.immutable = True
+    return response
+
+
+# グローバルインスタンス
+asset_manifest = AssetManifest()
@@ -0,0 +1,254 @@
+"""
+永続的キャッシュの保存形式のベンチマーク
+全年度の出場者・大会結果のDataFrameを、pickleとArrow形式（メモリマップ）で保存し、
+ファイルからの読み込み時間とメモリ使用量を比較する
+文字列の列が中心の現在のデータではpickleの方が速く小さいため、
+永続的キャッシュ（cache.py）はpickleのみで保存している
+
+使い方:
+    python -m app.modules.optimization.benchmark [--repeat 20] [--scale 1]
+"""
+
+import argparse
+import gc
+import multiprocessing
+import os
+import pickle
+import resource
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+except ImportError:
+    # pyarrowがない環境ではpickleのみ計測する
+    pa = None
+
+from ..data.participant_store import PARTICIPANT_YEARS
+from ..data.registry import data_registry
+from ..data.result_store import RESULT_DIR
+
+
+def get_memory_usage() -> dict:
+    """
+    現在のプロセスのメモリ使用量を取得します。
+    Linuxでは/procから、それ以外の環境では最大RSSを取得します。
+
+    Returns:
+        dict: rss（常駐メモリ）, private（他のプロセスと共有していないメモリ）のバイト数。
+            取得できない値はNone。
+    """
+    usage = {"rss": None, "private": None}
+    try:
+        with open("/proc/self/smaps_rollup", "r") as f:
+            for line in f:
+                name, value = line.split(":", 1)
+                if name == "Rss":
+                    usage["rss"] = int(value.split()[0]) * 1024
+                elif name in ("Private_Clean", "Private_Dirty"):
+                    usage["private"] = (usage["private"] or 0) + int(
+                        value.split()[0]
+                    ) * 1024
+    except (OSError, ValueError):
+        # ru_maxrssはLinuxではKB、macOSではバイト
+        usage["rss"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+    return usage
+
+
+def save_frame(path: str, df: pd.DataFrame, columnar: bool) -> None:
+    """
+    DataFrameをファイルに保存します。
+
+    Args:
+        path (str): 保存先のファイルのパス
+        df (pd.DataFrame): 保存するDataFrame
+        columnar (bool): Arrow IPC (Feather v2) 形式で保存するか（Falseの場合はpickle）
+
+    Returns:
+        None
+    """
+    if not columnar:
+        with open(path, "wb") as f:
+            f.write(pickle.dumps(df))
+        return
+
+    table = pa.Table.from_pandas(df, preserve_index=True)
+    with pa.OSFile(path, "wb") as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+
+
+def load_frame(path: str, columnar: bool) -> pd.DataFrame:
+    """
+    ファイルからDataFrameを読み込みます。
+    Arrow形式のファイルはメモリマップで読み込み、数値の列はマップしたページをそのまま参照します。
+
+    Args:
+        path (str): 読み込むファイルのパス
+        columnar (bool): Arrow形式で保存されているか
+
+    Returns:
+        pd.DataFrame: 読み込んだDataFrame
+    """
+    if not columnar:
+        with open(path, "rb") as f:
+            return pickle.loads(f.read())
+
+    table = pa.ipc.open_file(pa.memory_map(path, "r")).read_all()
+    return table.to_pandas(split_blocks=True)
+
+
+def measure_load_memory(cache_dir: str, columnar: bool, keys: list) -> dict:
+    """
+    ファイルから全件を読み込んで保持した状態の、メモリ使用量の増加を計測します。
+
+    Args:
+        cache_dir (str): 保存先のディレクトリのパス
+        columnar (bool): Arrow形式で保存されているか
+        keys (list): 読み込むDataFrameの名前のリスト
+
+    Returns:
+        dict: rss, privateの増加量（バイト）
+    """
+    gc.collect()
+    before = get_memory_usage()
+
+    loaded = [  # noqa: F841
+        load_frame(os.path.join(cache_dir, key), columnar) for key in keys
+    ]
+
+    after = get_memory_usage()
+    return {
+        name: None if before[name] is None else after[name] - before[name]
+        for name in before
+    }
+
+
+def load_benchmark_frames(scale: int = 1) -> dict:
+    """
+    ベンチマークに使う全年度の出場者・大会結果のDataFrameを読み込みます。
+
+    Args:
+        scale (int, optional): 各DataFrameを何倍の行数にするか。データの増加を想定した計測用。
+
+    Returns:
+        dict: 名前をキーとしたDataFrame
+    """
+    frames = {}
+    for year in PARTICIPANT_YEARS:
+        frames[f"participants_{year}"] = data_registry.participants.get_beatboxers_df(
+            year
+        )
+
+    for year in sorted(os.listdir(RESULT_DIR)):
+        for index, category in enumerate(data_registry.results.get_categories(year)):
+            result_csv_path = os.path.join(RESULT_DIR, year, f"{category}.csv")
+            frames[f"result_{year}_{index}"] = pd.read_csv(result_csv_path)
+
+    if scale > 1:
+        frames = {
+            key: pd.concat([df] * scale, ignore_index=True)
+            for key, df in frames.items()
+        }
+    return frames
+
+
+def benchmark_format(frames: dict, columnar: bool, repeat: int) -> dict:
+    """
+    指定された保存形式で、ファイルからの読み込み時間とメモリ使用量を計測します。
+
+    Args:
+        frames (dict): 名前をキーとしたDataFrame
+        columnar (bool): Arrow形式で保存するか（Falseの場合はpickle）
+        repeat (int): 読み込みを繰り返す回数
+
+    Returns:
+        dict: 保存形式、ファイルサイズ、1回あたりの全件読み込み時間、メモリ使用量の増加
+    """
+    with tempfile.TemporaryDirectory() as cache_dir:
+        for key, df in frames.items():
+            save_frame(os.path.join(cache_dir, key), df, columnar)
+
+        file_size = sum(
+            os.path.getsize(os.path.join(cache_dir, filename))
+            for filename in os.listdir(cache_dir)
+        )
+
+        start = time.perf_counter()
+        for _ in range(repeat):
+            for key in frames:
+                load_frame(os.path.join(cache_dir, key), columnar)
+        load_time = (time.perf_counter() - start) / repeat
+
+        # 全件を読み込んで保持した状態のメモリ使用量の増加
+        # このプロセスでは解放済みのメモリが再利用されるため、新しいプロセスで計測する
+        with ProcessPoolExecutor(
+            max_workers=1, mp_context=multiprocessing.get_context("spawn")
+        ) as executor:
+            memory_delta = executor.submit(
+                measure_load_memory, cache_dir, columnar, list(frames)
+            ).result()
+
+    return {
+        "format": "arrow (mmap)" if columnar else "pickle",
+        "file_size": file_size,
+        "load_time": load_time,
+        "rss_delta": memory_delta["rss"],
+        "private_delta": memory_delta["private"],
+    }
+
+
+def format_bytes(value) -> str:
+    """
+    バイト数を表示用の文字列に変換します。
+
+    Args:
+        value (int | None): バイト数
+
+    Returns:
+        str: KB単位の文字列。値がない場合は"-"。
+    """
+    return "-" if value is None else f"{value / 1024:,.1f} KB"
+
+
+def run_benchmark(repeat: int = 20, scale: int = 1) -> list:
+    """
+    pickleとArrow形式のベンチマークを実行し、結果を表示します。
+
+    Args:
+        repeat (int, optional): 読み込みを繰り返す回数
+        scale (int, optional): 各DataFrameを何倍の行数にするか
+
+    Returns:
+        list: 保存形式ごとの計測結果
+    """
+    frames = load_benchmark_frames(scale)
+    num_rows = sum(len(df) for df in frames.values())
+    print(f"DataFrame: {len(frames)}件, {num_rows:,}行 (scale={scale})")
+
+    formats = [False, True] if pa is not None else [False]
+    if pa is None:
+        print("pyarrowがインストールされていないため、pickleのみ計測します")
+
+    results = [benchmark_format(frames, columnar, repeat) for columnar in formats]
+    for result in results:
+        print(
+            f"{result['format']:>13}: "
+            f"ファイル {format_bytes(result['file_size'])}, "
+            f"読み込み {result['load_time'] * 1000:.2f} ms, "
+            f"RSS +{format_bytes(result['rss_delta'])}, "
+            f"非共有メモリ +{format_bytes(result['private_delta'])}"
+        )
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=20, help="読み込みを繰り返す回数")
+    parser.add_argument("--scale", type=int, default=1, help="DataFrameの行数の倍率")
+    args = parser.parse_args()
+
+    run_benchmark(repeat=args.repeat, scale=args.scale)
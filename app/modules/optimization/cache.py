@@ -6,11 +6,41 @@
 import os
 import pickle
 import re
-from typing import Any, Optional
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Optional
 
 import pandas as pd
-
-from ..config import AVAILABLE_YEARS
+import polib
+
+try:
+    import fcntl
+except ImportError:
+    # Windowsではプロセス間のファイルロックを行わない
+    fcntl = None
+
+from ..config import (
+    AVAILABLE_LANGS,
+    AVAILABLE_YEARS,
+    PERSISTENT_CACHE_MEMORY_BUDGET,
+)
+from ..data.participant_store import (
+    PARTICIPANTS_DIR,
+    VERSION_CHECK_INTERVAL,
+    get_file_signature,
+)
+from ..data.registry import data_registry
+from ..data.result_store import RESULT_DIR
+from .metrics import CacheMetrics, MeteredLRUCache, metrics_registry
+
+# 言語ごとのPOファイルがあるディレクトリ
+TRANSLATIONS_DIR = os.path.join("app", "translations")
+
+# キャッシュの保存形式のバージョン
+# エントリの形式や保存するデータの作り方を変えた場合はこの値を上げ、既存のキャッシュを破棄する
+CACHE_SCHEMA_VERSION = 1
 
 
 class PersistentCache:
@@ -18,37 +48,70 @@ class PersistentCache:
     永続的キャッシュを管理するクラス。
     CSVデータ、カテゴリ情報、翻訳情報などを効率的にキャッシュし、
     アプリケーションの起動速度とレスポンス速度を向上させます。
+    各エントリはスキーマのバージョンと元ファイルの署名を持ち、
+    どちらかが変わった場合は読み込み時に破棄されて作り直されます。
+    ファイルへの書き込みはアトミックに行い、作り直しはキーごとのファイルロックで
+    1つのプロセスのみが行うため、複数のワーカーで同じキャッシュを共有できます。
 
     Attributes:
         cache_dir (str): キャッシュファイルを保存するディレクトリパス
-        memory_cache (dict): メモリ内キャッシュ用の辞書
+        memory_cache (MeteredLRUCache): メモリ内キャッシュ。エントリのおおよそのバイト数の合計が
+            memory_budgetを超えると、最も長く使われていないエントリから破棄します。
+            破棄されたエントリは次回ファイルキャッシュから読み込みます。
+        memory_budget (int): メモリ内キャッシュの上限（バイト）
+        metrics (CacheMetrics): ヒット・ミス・破棄・作成時間の記録先
     """
 
-    def __init__(self, cache_dir: str = "cache"):
+    def __init__(
+        self,
+        cache_dir: str = "cache",
+        memory_budget: int = PERSISTENT_CACHE_MEMORY_BUDGET,
+        metrics_name: str = None,
+    ):
         """
         PersistentCacheクラスのコンストラクタ。
         キャッシュディレクトリを作成し、メモリキャッシュを初期化します。
 
         Args:
             cache_dir (str, optional): キャッシュディレクトリのパス。デフォルトは"cache"。
+            memory_budget (int, optional): メモリ内キャッシュの上限（バイト）。
+            metrics_name (str, optional): 統計レジストリに登録する名前。
+                Noneの場合は登録せず、統計はこのインスタンスのみで記録します。
 
         Returns:
             None
         """
         self.cache_dir = cache_dir
-        self.memory_cache = {}
+        self.memory_budget = memory_budget
+
+        if metrics_name is None:
+            self.metrics = CacheMetrics("persistent_cache", self.stats)
+        else:
+            self.metrics = metrics_registry.register(metrics_name, self.stats)
+
+        # 値は (エントリ, pickle化したサイズ) のタプル
+        self.memory_cache = MeteredLRUCache(
+            maxsize=memory_budget,
+            getsizeof=lambda item: item[1],
+            metrics=self.metrics,
+        )
+        self._memory_lock = threading.Lock()
+        # キーごとの、メモリ内のエントリの元ファイルを最後に確認した時刻
+        self._checked_at = {}
+        self._thread_locks = {}
+        self._locks_lock = threading.Lock()
 
-        # キャッシュディレクトリを作成
-        if not os.path.exists(cache_dir):
-            os.makedirs(cache_dir)
+        # キャッシュディレクトリを作成（複数のプロセスが同時に作成しても失敗しない）
+        os.makedirs(cache_dir, exist_ok=True)
 
-    def _get_cache_path(self, key: str) -> str:
+    def _get_cache_path(self, key: str, extension: str = "pkl") -> str:
         """
         指定されたキーに対応するキャッシュファイルのパスを取得します。
         入力を正規化し、キャッシュディレクトリ内に限定します。
 
         Args:
             key (str): キャッシュキー
+            extension (str, optional): ファイルの拡張子。デフォルトは"pkl"。
 
         Returns:
             str: キャッシュファイルの完全パス
@@ -61,7 +124,7 @@ class PersistentCache:
             raise ValueError(f"Invalid cache key: {key}")
 
         # キャッシュファイル名を生成
-        cache_file = f"{key}.pkl"
+        cache_file = f"{key}.{extension}"
 
         # フルパスを生成し、キャッシュディレクトリ内に限定
         full_path = os.path.realpath(os.path.join(self.cache_dir, cache_file))
@@ -73,62 +136,302 @@ class PersistentCache:
 
         return full_path
 
-    def get(self, key: str) -> Any:
+    def get_source_signatures(self, sources: tuple) -> dict:
         """
-        キャッシュからデータを取得します。
-        メモリキャッシュを最優先し、一度キャッシュされたデータは永続的に使用します。
+        キャッシュの元になったファイルの署名を取得します。
+
+        Args:
+            sources (tuple): 元ファイル・ディレクトリのパスのタプル
+
+        Returns:
+            dict: パスをキーとした (更新日時[ns], サイズ)
+        """
+        return {path: get_file_signature(path) for path in sources}
+
+    def _is_valid(self, entry: Any) -> bool:
+        """
+        キャッシュエントリが現在のスキーマで作成され、元ファイルが変わっていないか検証します。
+        元ファイルの更新日時とサイズのみを比較するため、ファイルの内容は読みません。
+
+        Args:
+            entry (Any): キャッシュエントリ
+
+        Returns:
+            bool: 有効な場合True
+        """
+        if not isinstance(entry, dict) or entry.get("schema") != CACHE_SCHEMA_VERSION:
+            return False
+
+        sources = entry["sources"]
+        return self.get_source_signatures(tuple(sources)) == sources
+
+    def _is_fresh(self, key: str, entry: Any) -> bool:
+        """
+        メモリ内のキャッシュエントリが有効か検証します。
+        元ファイルの確認はキーごとにVERSION_CHECK_INTERVAL秒に1回までに制限し、
+        リクエストごとにファイルの署名を取得しないようにします。
+
+        Args:
+            key (str): データのキー
+            entry (Any): メモリ内のキャッシュエントリ
+
+        Returns:
+            bool: 有効な場合True
+        """
+        now = time.monotonic()
+        checked_at = self._checked_at.get(key)
+        if checked_at is not None and now - checked_at < VERSION_CHECK_INTERVAL:
+            return True
+
+        if not self._is_valid(entry):
+            return False
+
+        self._checked_at[key] = now
+        return True
+
+    def _memory_get(self, key: str) -> Any:
+        """
+        メモリ内キャッシュからエントリを取得します（LRUの順番を更新）。
 
         Args:
             key (str): 取得するデータのキー
 
         Returns:
-            Any: キャッシュされたデータ。キャッシュが存在しない場合はNoneを返します。
+            Any: キャッシュエントリ。メモリにない場合はNone。
+        """
+        with self._memory_lock:
+            item = self.memory_cache.get(key)
+        return None if item is None else item[0]
+
+    def _memory_set(self, key: str, entry: Any, size: int) -> None:
+        """
+        メモリ内キャッシュにエントリを保存します。
+        上限を超える場合は、最も長く使われていないエントリから破棄します。
+        上限より大きいエントリはメモリには保存せず、ファイルキャッシュのみを使います。
+
+        Args:
+            key (str): 保存するデータのキー
+            entry (Any): キャッシュエントリ
+            size (int): エントリのおおよそのバイト数（pickle化したサイズ）
+
+        Returns:
+            None
+        """
+        with self._memory_lock:
+            self.memory_cache.pop(key, None)
+            self._checked_at.pop(key, None)
+            if size <= self.memory_budget:
+                self.memory_cache[key] = (entry, size)
+
+    def _memory_pop(self, key: str) -> None:
         """
-        # メモリキャッシュから確認（最優先、ファイルは見ない）
-        if key in self.memory_cache:
-            return self.memory_cache[key]
+        メモリ内キャッシュからエントリを削除します。
+
+        Args:
+            key (str): 削除するデータのキー
+
+        Returns:
+            None
+        """
+        with self._memory_lock:
+            self.memory_cache.pop(key, None)
+            self._checked_at.pop(key, None)
+
+    def _load_entry(self, key: str) -> tuple:
+        """
+        ファイルキャッシュからエントリを読み込みます。
+        書き込みは一時ファイルの置き換えで行うため、書き込み途中のファイルは読まれません。
+
+        Args:
+            key (str): 読み込むデータのキー
 
-        # メモリにない場合のみファイルキャッシュから読み込み
+        Returns:
+            tuple: (キャッシュエントリ, ファイルのバイト数)。
+                ファイルがない・読み込めない場合は (None, 0)。
+        """
         cache_path = self._get_cache_path(key)
-        if os.path.exists(cache_path):
-            try:
-                with open(cache_path, "rb") as f:
-                    data = pickle.load(f)
-                    # メモリにキャッシュして今後はファイルを見ない
-                    self.memory_cache[key] = data
-                    return data
-            except Exception:
-                # キャッシュファイルが破損している場合は削除
-                os.remove(cache_path)
+        try:
+            with open(cache_path, "rb") as f:
+                payload = f.read()
+            return pickle.loads(payload), len(payload)
+        except FileNotFoundError:
+            return None, 0
+        except Exception:
+            # 破損したファイルは次の保存で置き換えられるため、ここでは削除しない
+            return None, 0
 
-        return None
+    def _lookup(self, key: str) -> tuple:
+        """
+        メモリキャッシュ、ファイルキャッシュの順にデータを探します。
+        スキーマのバージョンが異なる、または元ファイルが更新されたエントリは使いません。
+        （メモリ内のエントリの元ファイルの確認は、VERSION_CHECK_INTERVAL秒に1回まで）
 
-    def set(self, key: str, data: Any) -> None:
+        Args:
+            key (str): 取得するデータのキー
+
+        Returns:
+            tuple: (データ, 見つかった場所)。見つかった場所は "memory" または "disk"。
+                キャッシュが存在しない・古い場合は (None, None)。
+        """
+        # メモリキャッシュから確認（最優先）
+        entry = self._memory_get(key)
+        if entry is not None and self._is_fresh(key, entry):
+            return entry["data"], "memory"
+
+        # メモリにない（破棄された）、またはメモリのエントリが古い場合は
+        # ファイルキャッシュを読み込む（他のプロセスが作り直している場合がある）
+        self._memory_pop(key)
+        entry, size = self._load_entry(key)
+        if entry is None or not self._is_valid(entry):
+            return None, None
+
+        # メモリにキャッシュして次回はファイルを読まない
+        self._memory_set(key, entry, size)
+        return entry["data"], "disk"
+
+    def get(self, key: str) -> Any:
+        """
+        キャッシュからデータを取得します。
+        メモリキャッシュを優先し、なければファイルキャッシュを読み込みます。
+        スキーマのバージョンが異なる、または元ファイルが更新されたエントリは使いません。
+
+        Args:
+            key (str): 取得するデータのキー
+
+        Returns:
+            Any: キャッシュされたデータ。キャッシュが存在しない・古い場合はNoneを返します。
+        """
+        data, location = self._lookup(key)
+        if location is None:
+            self.metrics.increment("misses")
+        else:
+            self.metrics.increment("hits")
+            if location == "disk":
+                self.metrics.increment("disk_hits")
+        return data
+
+    def set(self, key: str, data: Any, sources: dict = None) -> None:
         """
         データをメモリキャッシュに保存し、永続化のためファイルにも保存します。
+        スキーマのバージョンと元ファイルの署名を一緒に記録します。
+        ファイルは一時ファイルに書き込んでから置き換えるため、
+        他のプロセスが書き込み途中のファイルを読むことはありません。
 
         Args:
             key (str): 保存するデータのキー
             data (Any): 保存するデータ
+            sources (dict, optional): get_source_signaturesで取得した元ファイルの署名。
+                データを作成する前に取得したものを渡します。
 
         Returns:
             None
         """
+        entry = {
+            "schema": CACHE_SCHEMA_VERSION,
+            "sources": sources or {},
+            "data": data,
+        }
+
+        # サイズの計算とファイルへの保存に同じpickleを使う
+        payload = pickle.dumps(entry)
+
         # メモリキャッシュに保存（最優先）
-        self.memory_cache[key] = data
+        self._memory_set(key, entry, len(payload))
 
         # ファイルキャッシュに保存（永続化のため）
         cache_path = self._get_cache_path(key)
         try:
-            with open(cache_path, "wb") as f:
-                pickle.dump(data, f)
+            fd, tmp_path = tempfile.mkstemp(
+                prefix=f".{key}.", suffix=".tmp", dir=self.cache_dir
+            )
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    f.write(payload)
+                os.replace(tmp_path, cache_path)
+            except BaseException:
+                os.remove(tmp_path)
+                raise
         except Exception as e:
             print(f"キャッシュ保存エラー: {e}")
 
+    @contextmanager
+    def lock(self, key: str):
+        """
+        キーごとのファイルロックを取得します（プロセス間で有効）。
+        fcntlが使えない環境では、プロセス内のロックのみ行います。
+
+        Args:
+            key (str): ロックするデータのキー
+
+        Yields:
+            None
+        """
+        with self._locks_lock:
+            thread_lock = self._thread_locks.setdefault(key, threading.Lock())
+
+        with thread_lock:
+            if fcntl is None:
+                yield
+                return
+
+            with open(self._get_cache_path(key, extension="lock"), "a") as lock_file:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def get_or_build(self, key: str, sources: tuple, build: Callable[[], Any]) -> Any:
+        """
+        キャッシュからデータを取得し、ない・古い場合は作成して保存します。
+        作成はキーごとのロックの中で行うため、複数のプロセスが同時に起動しても
+        作成するのは1つのプロセスのみで、他のプロセスは完了を待って結果を再利用します。
+
+        Args:
+            key (str): データのキー
+            sources (tuple): データの元になるファイル・ディレクトリのパスのタプル
+            build (Callable[[], Any]): データを作成する関数
+
+        Returns:
+            Any: キャッシュされた、または作成したデータ
+        """
+        data = self.get(key)
+        if data is not None:
+            return data
+
+        with self.lock(key):
+            # ロック待ちの間に他のプロセスが作成済みの場合はそれを使う
+            # （ミスは最初の確認で記録済みのため、ここでは記録しない）
+            data, _ = self._lookup(key)
+            if data is not None:
+                return data
+
+            # 元ファイルの署名はデータの作成前に取得する
+            signatures = self.get_source_signatures(sources)
+            start = time.perf_counter()
+            data = build()
+            self.metrics.record_load(time.perf_counter() - start)
+            self.set(key, data, signatures)
+            return data
+
+    def stats(self) -> dict:
+        """
+        メモリ内キャッシュの使用状況を取得します。
+
+        Returns:
+            dict: エントリ数、使用中のバイト数、上限のバイト数
+        """
+        with self._memory_lock:
+            return {
+                "entries": len(self.memory_cache),
+                "size": self.memory_cache.currsize,
+                "maxsize": self.memory_cache.maxsize,
+            }
+
     def get_csv_data(self, year: int) -> Optional[pd.DataFrame]:
         """
-        指定された年度のCSVデータを永続的キャッシュから取得します。
-        キャッシュにない場合はファイルから読み込み、結果をキャッシュに保存します。
+        指定された年度のCSVデータを取得します。
+        CSVの読み込みはデータレジストリが1回だけ行うため、ここでは保存しません。
 
         Args:
             year (int): 取得する年度
@@ -141,29 +444,12 @@ class PersistentCache:
         if year not in AVAILABLE_YEARS:
             raise ValueError(f"Invalid year specified: {year}")
 
-        csv_path = os.path.join("app", "database", "participants", f"{year}.csv")
-        cache_key = f"csv_{year}"
-
-        # キャッシュから取得を試行
-        cached_data = self.get(cache_key)
-        if cached_data is not None:
-            return cached_data
-
-        # キャッシュにない場合は読み込み
-        try:
-            df = pd.read_csv(csv_path)
-            df = df.fillna("")
-            self.set(cache_key, df)
-            return df
-        except FileNotFoundError:
-            empty_df = pd.DataFrame()
-            self.set(cache_key, empty_df)
-            return empty_df
+        return data_registry.participants.get_beatboxers_df(year)
 
     def get_categories(self, year: int) -> list:
         """
         指定された年度のカテゴリ一覧を永続的キャッシュから取得します。
-        キャッシュにない場合はCSVデータから計算し、結果をキャッシュに保存します。
+        キャッシュにない場合はデータレジストリから取得し、結果をキャッシュに保存します。
 
         Args:
             year (int): 取得する年度
@@ -171,27 +457,17 @@ class PersistentCache:
         Returns:
             list: カテゴリ名のリスト。データが存在しない場合は空のリストを返します。
         """
-        cache_key = f"categories_{year}"
-
-        # キャッシュから取得を試行
-        cached_categories = self.get(cache_key)
-        if cached_categories is not None:
-            return cached_categories
-
-        # キャッシュにない場合はCSVから計算
-        df = self.get_csv_data(year)
-        if df.empty:
-            categories = []
-        else:
-            categories = df["category"].unique().tolist()
-
-        self.set(cache_key, categories)
-        return categories
+        # キャッシュにない・古い場合はCSVデータから計算
+        return self.get_or_build(
+            f"categories_{year}",
+            (os.path.join(PARTICIPANTS_DIR, f"{year}.csv"),),
+            lambda: data_registry.participants.get_categories(year),
+        )
 
     def get_result_categories(self, year: int) -> list:
         """
         指定された年度の結果カテゴリ一覧を永続的キャッシュから取得します。
-        キャッシュにない場合は結果ディレクトリから読み込み、結果をキャッシュに保存します。
+        キャッシュにない場合はデータレジストリから取得し、結果をキャッシュに保存します。
 
         Args:
             year (int): 取得する年度
@@ -200,105 +476,96 @@ class PersistentCache:
             list: 結果カテゴリ名のリスト（Loopstation, Producerが先頭に配置）。
                   ディレクトリが存在しない場合は空のリストを返します。
         """
-        # ディレクトリの範囲チェック
-        base_dir = os.path.join(".", "app", "database", "result")
-        result_dir = os.path.realpath(os.path.join(base_dir, str(year)))
-        base_dir = os.path.realpath(base_dir)
+        # キャッシュにない・古い場合は結果ディレクトリから読み込み
+        # （ファイルの追加・削除でディレクトリの更新日時が変わる）
+        return self.get_or_build(
+            f"result_categories_{year}",
+            (os.path.join(RESULT_DIR, str(year)),),
+            lambda: list(data_registry.results.get_categories(year)),
+        )
 
-        # Validate that the result directory is within the base directory
-        if not result_dir.startswith(base_dir + os.sep):
-            empty_list = []
-            self.set(f"result_categories_{year}", empty_list)
-            return empty_list
+    def get_translated_paths(self, user_lang: str = "en") -> frozenset:
+        """
+        指定された言語で翻訳が存在するページのパス一覧を永続的キャッシュから取得します。
+        キャッシュにない場合はその言語のPOファイルから解析し、結果をキャッシュに保存します。
 
-        cache_key = f"result_categories_{year}"
+        Args:
+            user_lang (str, optional): 対象言語。デフォルトは英語。
 
-        # キャッシュから取得を試行
-        cached_categories = self.get(cache_key)
-        if cached_categories is not None:
-            return cached_categories
+        Returns:
+            frozenset: 翻訳されたページのパスセット。
+                 POファイルが存在しない言語の場合は空のセットを返します。
+        """
+        # 言語コードはキャッシュキーとパスの組み立てに使うため、利用可能な言語のみ受け付ける
+        if user_lang not in AVAILABLE_LANGS:
+            return frozenset()
 
-        # キャッシュにない場合は読み込み
-        try:
-            all_category = os.listdir(result_dir)
-            all_category = [category.replace(".csv", "") for category in all_category]
+        po_file_path = os.path.join(
+            TRANSLATIONS_DIR, user_lang, "LC_MESSAGES", "messages.po"
+        )
 
-            # Loopstation, Producerを先頭に
-            all_category.sort(
-                key=lambda x: (x == "Loopstation", x == "Producer"),
-                reverse=True,
-            )
-            self.set(cache_key, all_category)
-            return all_category
-        except Exception:
-            empty_list = []
-            self.set(cache_key, empty_list)
-            return empty_list
+        # キャッシュにない・古い場合はPOファイルから解析
+        return self.get_or_build(
+            f"translated_paths_{user_lang}",
+            (po_file_path,),
+            lambda: self._parse_translated_paths(po_file_path),
+        )
 
-    def get_translated_paths(self) -> set:
+    def warmup_translated_paths(self) -> None:
         """
-        翻訳が存在するページのパス一覧を永続的キャッシュから取得します。
-        キャッシュにない場合はPOファイルから解析し、結果をキャッシュに保存します。
+        すべての言語の翻訳されたページのパス一覧を事前に読み込みます。
 
         Returns:
-            set: 翻訳されたページのパスセット。
-                 POファイルが存在しない場合は空のセットを返します。
+            None
         """
-        po_file_path = os.path.join(
-            "app", "translations", "en", "LC_MESSAGES", "messages.po"
-        )
-        cache_key = "translated_paths"
+        for user_lang in AVAILABLE_LANGS:
+            self.get_translated_paths(user_lang)
 
-        # キャッシュから取得を試行
-        cached_paths = self.get(cache_key)
-        if cached_paths is not None:
-            return cached_paths
+    def _parse_translated_paths(self, po_file_path: str) -> frozenset:
+        """
+        POファイルから、翻訳が存在するページのパス一覧を解析します。
+        翻訳済み（空でなく、fuzzyでない）のメッセージが使われているテンプレートのみを対象とします。
 
-        # キャッシュにない場合は読み込み
-        translated_paths = set()
+        Args:
+            po_file_path (str): POファイルのパス
 
+        Returns:
+            frozenset: 翻訳されたページのパスセット。
+                 POファイルが存在しない場合は空のセットを返します。
+        """
         try:
-            with open(po_file_path, "r", encoding="utf-8") as f:
-                po_content = f.read()
-        except FileNotFoundError:
-            self.set(cache_key, translated_paths)
-            return translated_paths
-
-        exclude_words = [r":\d+", "templates/", ".html"]
-
-        for line in po_content.split("\n"):
-            if line.startswith("#: templates/"):
-                paths = line.replace("#:", "").split()
-
-                for path in paths:
-                    # 除外条件
-                    if any(
-                        exclude in path
-                        for exclude in [
-                            "templates/base.html",
-                            "templates/includes/",
-                            "404.html",
-                        ]
-                    ):
-                        continue
+            po = polib.pofile(po_file_path)
+        except OSError:
+            return frozenset()
 
-                    # パスの正規化
-                    if path.startswith("templates/"):
-                        for word in exclude_words:
-                            path = re.sub(word, "", path)
-
-                    # common/の場合は年度を追加
-                    if path.startswith("common/"):
-                        for year in AVAILABLE_YEARS:
-                            formatted_path = f"/{year}/{path.replace('common/', '')}"
-                            translated_paths.add(formatted_path)
-                        continue
-
-                    translated_paths.add("/" + path)
-
-        self.set(cache_key, translated_paths)
-        return translated_paths
+        translated_paths = set()
+        for entry in po.translated_entries():
+            for path, _ in entry.occurrences:
+                # 除外条件
+                if not path.startswith("templates/") or any(
+                    exclude in path
+                    for exclude in [
+                        "templates/base.html",
+                        "templates/includes/",
+                        "404.html",
+                    ]
+                ):
+                    continue
+
+                # パスの正規化（templates/2025/top.html -> 2025/top）
+                path = path.removeprefix("templates/").removesuffix(".html")
+
+                # common/の場合は年度を追加
+                if path.startswith("common/"):
+                    for year in AVAILABLE_YEARS:
+                        formatted_path = f"/{year}/{path.replace('common/', '')}"
+                        translated_paths.add(formatted_path)
+                    continue
+
+                translated_paths.add("/" + path)
+
+        return frozenset(translated_paths)
 
 
 # グローバルインスタンス
-persistent_cache = PersistentCache()
+persistent_cache = PersistentCache(metrics_name="persistent_cache")
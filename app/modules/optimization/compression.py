@@ -0,0 +1,348 @@
+"""
+レスポンス圧縮モジュール
+Accept-Encodingに応じて、静的ファイルは事前に圧縮したファイル（.br, .gz）を返し、
+動的なレスポンスは一定のサイズ以上の場合にその場で圧縮する
+
+事前圧縮（ビルド時に実行）:
+    python -m app.modules.optimization.compression [--force] [ディレクトリ ...]
+"""
+
+import argparse
+import gzip
+import os
+import tempfile
+
+from flask import current_app, request
+from werkzeug.security import safe_join
+
+try:
+    import brotli
+except ImportError:
+    # brotliがない環境ではgzipのみ使う
+    brotli = None
+    print(
+        "brotliがインストールされていないため、レスポンスはgzipのみで圧縮します",
+        flush=True,
+    )
+
+from ..config import COMPRESSION_CACHE_MAXSIZE, COMPRESSION_MIN_SIZE
+from .assets import asset_manifest
+from .query_cache import QueryCache
+
+# 圧縮するレスポンスのMIMEタイプ
+COMPRESSIBLE_MIMETYPES = (
+    "text/html",
+    "text/css",
+    "text/plain",
+    "text/javascript",
+    "application/javascript",
+    "application/json",
+    "application/manifest+json",
+    "application/xml",
+    "image/svg+xml",
+)
+
+# 圧縮するレスポンスのステータスコード
+COMPRESSIBLE_STATUS_CODES = (200, 404)
+
+# 事前圧縮するファイルの拡張子
+PRECOMPRESS_EXTENSIONS = (".css", ".js", ".json", ".svg", ".html", ".txt", ".xml")
+
+# 事前圧縮するディレクトリ
+PRECOMPRESS_DIRS = (os.path.join("app", "static"),)
+
+# エンコーディングごとの事前圧縮ファイルの拡張子
+ENCODING_EXTENSIONS = {"br": ".br", "gzip": ".gz"}
+
+
+def get_available_encodings() -> tuple:
+    """
+    使用できるエンコーディングを優先順に取得します。
+
+    Returns:
+        tuple: エンコーディング名のタプル（brotliがない環境ではgzipのみ）
+    """
+    return ("br", "gzip") if brotli is not None else ("gzip",)
+
+
+def compress(data: bytes, encoding: str, best: bool = False) -> bytes:
+    """
+    データを指定されたエンコーディングで圧縮します。
+
+    Args:
+        data (bytes): 圧縮するデータ
+        encoding (str): "br" または "gzip"
+        best (bool, optional): 最高圧縮率で圧縮するか（事前圧縮用）。
+            Falseの場合はレスポンスごとの圧縮に向いた速度重視の設定を使います。
+
+    Returns:
+        bytes: 圧縮したデータ
+    """
+    if encoding == "br":
+        return brotli.compress(data, quality=11 if best else 5)
+
+    # 同じ内容から同じバイト列になるよう、ヘッダーの更新日時は0にする
+    return gzip.compress(data, compresslevel=9 if best else 6, mtime=0)
+
+
+def choose_encoding(accept_encodings) -> str:
+    """
+    クライアントが受け付けるエンコーディングから、使用するものを選びます。
+    品質値が高いものを優先し、同じ場合はbrを優先します。
+
+    Args:
+        accept_encodings (werkzeug.datastructures.Accept): リクエストのAccept-Encoding
+
+    Returns:
+        str | None: エンコーディング名。使用できるものがない場合はNone。
+    """
+    best_encoding = None
+    best_quality = 0
+    for encoding in get_available_encodings():
+        quality = accept_encodings[encoding]
+        if quality > best_quality:
+            best_encoding = encoding
+            best_quality = quality
+    return best_encoding
+
+
+def precompress_file(path: str, force: bool = False) -> list:
+    """
+    ファイルを圧縮し、同じディレクトリに .br, .gz のファイルを作成します。
+    元のファイルより新しい圧縮ファイルがある場合は作り直しません。
+    圧縮しても小さくならない場合は作成しません。
+
+    Args:
+        path (str): 圧縮するファイルのパス
+        force (bool, optional): Trueの場合、既存の圧縮ファイルも作り直します。
+
+    Returns:
+        list: 作成した圧縮ファイルのパスのリスト
+    """
+    with open(path, "rb") as f:
+        data = f.read()
+    source_mtime = os.path.getmtime(path)
+
+    written = []
+    for encoding in get_available_encodings():
+        compressed_path = path + ENCODING_EXTENSIONS[encoding]
+        if (
+            not force
+            and os.path.exists(compressed_path)
+            and os.path.getmtime(compressed_path) >= source_mtime
+        ):
+            continue
+
+        compressed = compress(data, encoding, best=True)
+        if len(compressed) >= len(data):
+            continue
+
+        # 書き込み途中のファイルが配信されないよう、一時ファイルから置き換える
+        directory, filename = os.path.split(compressed_path)
+        fd, tmp_path = tempfile.mkstemp(
+            prefix=f".{filename}.", suffix=".tmp", dir=directory
+        )
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(compressed)
+            os.chmod(tmp_path, 0o644)
+            os.replace(tmp_path, compressed_path)
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+        written.append(compressed_path)
+
+    return written
+
+
+def precompress_directory(directory: str, force: bool = False) -> list:
+    """
+    ディレクトリ内の対象の拡張子のファイルをすべて事前圧縮します。
+
+    Args:
+        directory (str): 圧縮するディレクトリのパス
+        force (bool, optional): Trueの場合、既存の圧縮ファイルも作り直します。
+
+    Returns:
+        list: 作成した圧縮ファイルのパスのリスト
+    """
+    written = []
+    for root, _, files in os.walk(directory):
+        for filename in sorted(files):
+            if filename.endswith(PRECOMPRESS_EXTENSIONS):
+                written += precompress_file(os.path.join(root, filename), force)
+    return written
+
+
+class ResponseCompressor:
+    """
+    レスポンスを圧縮するクラス。
+    静的ファイルは事前に圧縮したファイルを優先し、それ以外はその場で圧縮します。
+    ETagを持つレスポンスの圧縮結果は (ETag, エンコーディング) ごとに保持し、
+    同じ内容を何度も圧縮しないようにします。
+
+    Attributes:
+        min_size (int): その場で圧縮するレスポンスの最小サイズ（バイト）
+        compressed (QueryCache): (ETag, エンコーディング) をキーとした圧縮済みの本文
+    """
+
+    def __init__(
+        self,
+        min_size: int = COMPRESSION_MIN_SIZE,
+        cache_maxsize: int = COMPRESSION_CACHE_MAXSIZE,
+    ):
+        """
+        ResponseCompressorクラスのコンストラクタ。
+
+        Args:
+            min_size (int, optional): その場で圧縮するレスポンスの最小サイズ（バイト）
+            cache_maxsize (int, optional): 保持する圧縮済みの本文の最大数
+
+        Returns:
+            None
+        """
+        self.min_size = min_size
+        self.compressed = QueryCache(name="compressed_responses", maxsize=cache_maxsize)
+
+    def _get_precompressed_path(self, encoding: str):
+        """
+        静的ファイルのリクエストに対応する、事前に圧縮したファイルのパスを取得します。
+
+        Args:
+            encoding (str): エンコーディング名
+
+        Returns:
+            str | None: 圧縮ファイルのパス。静的ファイルでない、
+                または元のファイルより古い・存在しない場合はNone。
+        """
+        if not request.view_args:
+            return None
+
+        if request.endpoint == "static":
+            filename = request.view_args["filename"]
+        elif request.endpoint == "assets":
+            # ハッシュ付きのURLは元のファイル名に戻す（書き換えたCSSはその場で圧縮）
+            filename = asset_manifest.get_source_name(request.view_args["filename"])
+        else:
+            filename = None
+
+        if filename is None:
+            return None
+
+        path = safe_join(current_app.static_folder, filename)
+        if path is None:
+            return None
+
+        compressed_path = path + ENCODING_EXTENSIONS[encoding]
+        try:
+            if os.path.getmtime(compressed_path) < os.path.getmtime(path):
+                return None
+        except OSError:
+            return None
+        return compressed_path
+
+    def _compress_body(self, response, encoding: str):
+        """
+        レスポンスの本文を圧縮します。
+
+        Args:
+            response (Response): レスポンス
+            encoding (str): エンコーディング名
+
+        Returns:
+            bytes | None: 圧縮した本文。小さすぎる・圧縮しても小さくならない場合はNone。
+        """
+        etag, weak = response.get_etag()
+        key = (etag, encoding)
+        if etag is not None and not weak:
+            cached_body = self.compressed.get(key, "")
+            if cached_body is not None:
+                return cached_body
+
+        data = response.get_data()
+        if len(data) < self.min_size:
+            return None
+
+        body = compress(data, encoding)
+        if len(body) >= len(data):
+            return None
+
+        if etag is not None and not weak:
+            self.compressed.set(key, "", body)
+        return body
+
+    def compress_response(self, response):
+        """
+        クライアントのAccept-Encodingに応じてレスポンスを圧縮します。
+        圧縮した場合、内容はエンコーディングごとに異なるため、ETagは弱いETagにします。
+
+        Args:
+            response (Response): レスポンス
+
+        Returns:
+            Response: 圧縮した、または元のレスポンス
+        """
+        if response.mimetype not in COMPRESSIBLE_MIMETYPES:
+            return response
+
+        # エンコーディングによって内容が変わることをキャッシュに伝える
+        response.vary.add("Accept-Encoding")
+
+        # send_fileのレスポンス（direct_passthrough）以外のストリーミングは圧縮しない
+        if (
+            response.status_code not in COMPRESSIBLE_STATUS_CODES
+            or "Content-Encoding" in response.headers
+            or (response.is_streamed and not response.direct_passthrough)
+            or "no-transform" in response.headers.get("Cache-Control", "")
+        ):
+            return response
+
+        encoding = choose_encoding(request.accept_encodings)
+        if encoding is None:
+            return response
+
+        compressed_path = self._get_precompressed_path(encoding)
+        if compressed_path is not None:
+            with open(compressed_path, "rb") as f:
+                body = f.read()
+        else:
+            # send_fileのレスポンスはファイルを直接返す設定のため、本文を読めるようにする
+            response.direct_passthrough = False
+            body = self._compress_body(response, encoding)
+            if body is None:
+                return response
+
+        # 本文を置き換え、send_fileで開いたファイルがあれば閉じる
+        original_body = response.response
+        response.set_data(body)
+        if hasattr(original_body, "close"):
+            original_body.close()
+        response.headers["Content-Encoding"] = encoding
+
+        etag, weak = response.get_etag()
+        if etag is not None and not weak:
+            response.set_etag(etag, weak=True)
+
+        return response
+
+
+# グローバルインスタンス
+response_compressor = ResponseCompressor()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="静的ファイルを事前に圧縮します")
+    parser.add_argument(
+        "directories", nargs="*", default=PRECOMPRESS_DIRS, help="圧縮するディレクトリ"
+    )
+    parser.add_argument(
+        "--force", action="store_true", help="既存の圧縮ファイルも作り直す"
+    )
+    args = parser.parse_args()
+
+    if brotli is None:
+        print("brotliがインストールされていないため、.gzのみ作成します")
+
+    for directory in args.directories:
+        written = precompress_directory(directory, force=args.force)
+        print(f"{directory}: {len(written)}件の圧縮ファイルを作成しました")
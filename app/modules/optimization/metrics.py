@@ -0,0 +1,342 @@
+"""
+キャッシュの統計モジュール
+名前付きのキャッシュごとにヒット・ミス・破棄・読み込み時間などを記録し、
+JSONまたはPrometheusのテキスト形式で取得できる統計レジストリを提供
+"""
+
+import threading
+import time
+from typing import Callable
+
+from cachetools import LRUCache, TTLCache
+
+# Prometheusの出力で使うメトリクス名の接頭辞
+PROMETHEUS_PREFIX = "gbbinfo_cache"
+
+# Prometheusの出力で使う、統計の種類と説明
+# ここにない数値の統計は gauge として出力する
+PROMETHEUS_METRICS = {
+    "hits": ("counter", "キャッシュヒット数"),
+    "misses": ("counter", "キャッシュミス数"),
+    "disk_hits": ("counter", "ファイルキャッシュからの読み込みでのヒット数"),
+    "evictions": ("counter", "上限を超えたため破棄したエントリ数"),
+    "expirations": ("counter", "有効期限切れで破棄したエントリ数"),
+    "invalidations": ("counter", "データの更新で全エントリを破棄した回数"),
+    "invalidated_entries": ("counter", "データの更新で破棄したエントリ数"),
+    "loads": ("counter", "キャッシュミス時にデータを作成した回数"),
+    "load_seconds_total": ("counter", "データの作成にかかった時間の合計（秒）"),
+    "load_seconds_max": ("gauge", "データの作成にかかった時間の最大値（秒）"),
+    "lookup_seconds_total": ("counter", "キャッシュの取得にかかった時間の合計（秒）"),
+    "entries": ("gauge", "保持しているエントリ数"),
+    "size": ("gauge", "保持しているエントリのおおよその合計バイト数"),
+    "maxsize": ("gauge", "キャッシュの上限（エントリ数またはバイト数）"),
+    "hit_rate": ("gauge", "キャッシュヒット率"),
+}
+
+
+class CacheMetrics:
+    """
+    1つのキャッシュの統計を記録するクラス。
+
+    Attributes:
+        name (str): キャッシュ名
+        counters (dict): 統計名をキーとしたカウンター
+        load_seconds_max (float): データの作成にかかった時間の最大値（秒）
+        stats_callback (Callable[[], dict]): エントリ数・サイズなど、
+            キャッシュ自身が持つ統計を返す関数
+    """
+
+    def __init__(self, name: str, stats_callback: Callable[[], dict] = None):
+        """
+        CacheMetricsクラスのコンストラクタ。
+
+        Args:
+            name (str): キャッシュ名
+            stats_callback (Callable[[], dict], optional): キャッシュ自身が持つ統計を返す関数
+
+        Returns:
+            None
+        """
+        self.name = name
+        self.counters = {"hits": 0, "misses": 0, "evictions": 0}
+        self.load_seconds_max = 0.0
+        self.stats_callback = stats_callback
+        self._lock = threading.Lock()
+
+    def increment(self, counter: str, value: float = 1) -> None:
+        """
+        カウンターを増やします。
+
+        Args:
+            counter (str): 統計名（hits, misses, evictions など）
+            value (float, optional): 増やす値。デフォルトは1。
+
+        Returns:
+            None
+        """
+        with self._lock:
+            self.counters[counter] = self.counters.get(counter, 0) + value
+
+    def record_load(self, seconds: float) -> None:
+        """
+        キャッシュミス時にデータを作成した時間を記録します。
+
+        Args:
+            seconds (float): 作成にかかった時間（秒）
+
+        Returns:
+            None
+        """
+        with self._lock:
+            self.counters["loads"] = self.counters.get("loads", 0) + 1
+            self.counters["load_seconds_total"] = (
+                self.counters.get("load_seconds_total", 0.0) + seconds
+            )
+            self.load_seconds_max = max(self.load_seconds_max, seconds)
+
+    def snapshot(self) -> dict:
+        """
+        現在の統計を取得します。
+
+        Returns:
+            dict: カウンター、ヒット率、キャッシュ自身が持つ統計をまとめた辞書
+        """
+        with self._lock:
+            stats = dict(self.counters)
+            if "loads" in stats:
+                stats["load_seconds_max"] = self.load_seconds_max
+
+        # キャッシュ自身が記録している統計（エントリ数・サイズ・ヒット数など）を優先
+        if self.stats_callback is not None:
+            stats.update(self.stats_callback())
+
+        stats["name"] = self.name
+        total = stats.get("hits", 0) + stats.get("misses", 0)
+        stats["hit_rate"] = stats.get("hits", 0) / total if total else 0.0
+        return stats
+
+
+class MetricsRegistry:
+    """
+    名前付きのキャッシュの統計をまとめて管理するクラス。
+
+    Attributes:
+        metrics (dict): キャッシュ名をキーとしたCacheMetrics
+    """
+
+    def __init__(self):
+        """
+        MetricsRegistryクラスのコンストラクタ。
+
+        Returns:
+            None
+        """
+        self.metrics = {}
+        self._lock = threading.Lock()
+
+    def register(
+        self, name: str, stats_callback: Callable[[], dict] = None
+    ) -> CacheMetrics:
+        """
+        キャッシュを登録し、統計の記録先を取得します。
+        同じ名前で登録済みの場合は、既存の記録先を返します。
+
+        Args:
+            name (str): キャッシュ名
+            stats_callback (Callable[[], dict], optional): キャッシュ自身が持つ統計を返す関数
+
+        Returns:
+            CacheMetrics: 統計の記録先
+        """
+        with self._lock:
+            metrics = self.metrics.get(name)
+            if metrics is None:
+                metrics = CacheMetrics(name, stats_callback)
+                self.metrics[name] = metrics
+            elif stats_callback is not None:
+                metrics.stats_callback = stats_callback
+            return metrics
+
+    def register_lru_cache(self, name: str, func) -> CacheMetrics:
+        """
+        functools.lru_cacheでデコレートされた関数を登録します。
+        ヒット・ミス・エントリ数はcache_info()から取得します。
+
+        Args:
+            name (str): キャッシュ名
+            func: lru_cacheでデコレートされた関数
+
+        Returns:
+            CacheMetrics: 統計の記録先
+        """
+
+        def stats():
+            info = func.cache_info()
+            return {
+                "hits": info.hits,
+                "misses": info.misses,
+                "entries": info.currsize,
+                "maxsize": info.maxsize,
+            }
+
+        return self.register(name, stats)
+
+    def snapshot(self) -> dict:
+        """
+        登録されているすべてのキャッシュの統計を取得します。
+
+        Returns:
+            dict: キャッシュ名をキーとした統計の辞書
+        """
+        with self._lock:
+            metrics_list = list(self.metrics.values())
+        return {metrics.name: metrics.snapshot() for metrics in metrics_list}
+
+    def to_prometheus(self) -> str:
+        """
+        すべてのキャッシュの統計をPrometheusのテキスト形式に変換します。
+
+        Returns:
+            str: Prometheusのテキスト形式の統計
+        """
+        # 統計名ごとに、キャッシュ名と値をまとめる
+        samples = {}
+        for name, stats in sorted(self.snapshot().items()):
+            for stat_name, value in stats.items():
+                if isinstance(value, bool) or not isinstance(value, (int, float)):
+                    continue
+                samples.setdefault(stat_name, []).append((name, value))
+
+        lines = []
+        for stat_name, values in sorted(samples.items()):
+            metric_type, description = PROMETHEUS_METRICS.get(
+                stat_name, ("gauge", stat_name)
+            )
+            metric_name = f"{PROMETHEUS_PREFIX}_{stat_name}"
+            # Prometheusの慣例に合わせ、カウンターの名前は _total で終える
+            if metric_type == "counter" and not metric_name.endswith("_total"):
+                metric_name += "_total"
+            lines.append(f"# HELP {metric_name} {description}")
+            lines.append(f"# TYPE {metric_name} {metric_type}")
+            for name, value in values:
+                lines.append(f'{metric_name}{{cache="{name}"}} {value}')
+
+        return "\n".join(lines) + "\n"
+
+
+class MeteredLRUCache(LRUCache):
+    """
+    上限を超えて破棄したエントリ数を記録するLRUCache。
+
+    Attributes:
+        metrics (CacheMetrics): 統計の記録先
+    """
+
+    def __init__(self, maxsize, getsizeof=None, metrics: CacheMetrics = None):
+        """
+        MeteredLRUCacheクラスのコンストラクタ。
+
+        Args:
+            maxsize: 上限（getsizeofの合計）
+            getsizeof (Callable, optional): エントリのサイズを返す関数
+            metrics (CacheMetrics, optional): 統計の記録先
+
+        Returns:
+            None
+        """
+        super().__init__(maxsize, getsizeof)
+        self.metrics = metrics
+
+    def popitem(self):
+        """
+        最も長く使われていないエントリを破棄し、破棄した数を記録します。
+
+        Returns:
+            tuple: 破棄した (キー, 値)
+        """
+        item = super().popitem()
+        if self.metrics is not None:
+            self.metrics.increment("evictions")
+        return item
+
+
+class MeteredTTLCache(TTLCache):
+    """
+    上限を超えて破棄したエントリ数と、有効期限切れのエントリ数を記録するTTLCache。
+
+    Attributes:
+        metrics (CacheMetrics): 統計の記録先
+    """
+
+    def __init__(self, maxsize, ttl, metrics: CacheMetrics = None):
+        """
+        MeteredTTLCacheクラスのコンストラクタ。
+
+        Args:
+            maxsize: 保持する最大エントリ数
+            ttl: エントリの有効期限（秒）
+            metrics (CacheMetrics, optional): 統計の記録先
+
+        Returns:
+            None
+        """
+        super().__init__(maxsize, ttl)
+        self.metrics = metrics
+
+    def popitem(self):
+        """
+        最も長く使われていないエントリを破棄し、破棄した数を記録します。
+
+        Returns:
+            tuple: 破棄した (キー, 値)
+        """
+        item = super().popitem()
+        if self.metrics is not None:
+            self.metrics.increment("evictions")
+        return item
+
+    def expire(self, time=None):
+        """
+        有効期限切れのエントリを破棄し、破棄した数を記録します。
+
+        Args:
+            time (float, optional): 基準の時刻
+
+        Returns:
+            list: 破棄した (キー, 値) のリスト
+        """
+        expired = super().expire(time)
+        if expired and self.metrics is not None:
+            self.metrics.increment("expirations", len(expired))
+        return expired
+
+
+def instrument_flask_cache(cache, name: str = "flask_cache") -> CacheMetrics:
+    """
+    flask_cachingのキャッシュのヒット・ミス・取得時間を記録するようにします。
+    flask_cachingは統計を持たないため、バックエンドのgetを包んで記録します。
+
+    Args:
+        cache (flask_caching.Cache): flask_cachingのキャッシュ
+        name (str, optional): キャッシュ名
+
+    Returns:
+        CacheMetrics: 統計の記録先
+    """
+    metrics = metrics_registry.register(name)
+    backend = cache.cache
+    backend_get = backend.get
+
+    def metered_get(key):
+        start = time.perf_counter()
+        value = backend_get(key)
+        metrics.increment("lookup_seconds_total", time.perf_counter() - start)
+        metrics.increment("misses" if value is None else "hits")
+        return value
+
+    backend.get = metered_get
+    return metrics
+
+
+# グローバルインスタンス
+metrics_registry = MetricsRegistry()
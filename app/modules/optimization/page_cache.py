@@ -0,0 +1,251 @@
+"""
+ページキャッシュモジュール
+描画済みのページを (パス, クエリ文字列, 言語) ごとにメモリに保持し、
+同じページへのリクエストではJinjaの描画を行わずにレスポンスを返す
+また、ページのバージョンから作成したETagで、クライアントの内容が最新の場合は304を返す
+"""
+
+import hashlib
+import os
+import threading
+import time
+from datetime import datetime
+from functools import wraps
+
+from flask import current_app, make_response, request, session
+
+from ..config import PAGE_CACHE_MAXSIZE
+from ..data.participant_store import (
+    VERSION_CHECK_INTERVAL,
+    get_file_signature,
+    participant_store,
+)
+from ..maps import ALL_PARTICIPANTS_MAP_PATH
+from .compression import choose_encoding
+from .query_cache import QueryCache
+
+# 変更を監視するディレクトリ（テンプレート、大会結果、翻訳）
+PAGE_CACHE_WATCH_DIRS = (
+    os.path.join("app", "templates"),
+    os.path.join("app", "database", "result"),
+    os.path.join("app", "translations"),
+)
+
+# 監視対象のディレクトリ内で、実行中に作成されるファイル（全年度の出場者世界地図）
+# 地図の内容は出場者データから作られるため、出場者データのバージョンで変更を検出できる
+PAGE_CACHE_EXCLUDED_FILES = (ALL_PARTICIPANTS_MAP_PATH,)
+
+# キャッシュに保存しないレスポンスヘッダー
+EXCLUDED_HEADERS = ("Content-Length", "Set-Cookie")
+
+
+class PageCache:
+    """
+    描画済みのページを保持するクラス。
+    出場者データ、テンプレート・大会結果・翻訳のファイル、現在の年、
+    プロセスの起動日時（設定のBUILD_ID）のいずれかが変わった時点で全ページを破棄します。
+    同じ値からETagを作成するため、ETagが一致するリクエストには描画せずに304を返します。
+
+    Attributes:
+        pages (QueryCache): (パス, クエリ, 言語) をキーとした (本文, ステータス, ヘッダー)
+        watch_dirs (tuple): 変更を監視するディレクトリ
+        excluded_files (frozenset): 監視対象から除くファイルのパス
+        files_version (str): 監視しているファイルの署名から作成したバージョン文字列
+    """
+
+    def __init__(
+        self,
+        maxsize: int = PAGE_CACHE_MAXSIZE,
+        watch_dirs: tuple = PAGE_CACHE_WATCH_DIRS,
+        excluded_files: tuple = PAGE_CACHE_EXCLUDED_FILES,
+    ):
+        """
+        PageCacheクラスのコンストラクタ。
+
+        Args:
+            maxsize (int, optional): 保持する最大ページ数
+            watch_dirs (tuple, optional): 変更を監視するディレクトリ
+            excluded_files (tuple, optional): 監視対象から除くファイル
+
+        Returns:
+            None
+        """
+        self.pages = QueryCache(name="pages", maxsize=maxsize)
+        self.watch_dirs = watch_dirs
+        self.excluded_files = frozenset(os.path.normpath(f) for f in excluded_files)
+        self.files_version = None
+        self._last_checked = 0.0
+        self._lock = threading.Lock()
+
+    def _compute_files_version(self) -> str:
+        """
+        監視しているディレクトリ内の全ファイルの署名からバージョン文字列を作成します。
+        ファイルの追加・削除・更新のいずれでも値が変わります。
+        実行中に作成されるファイルと、書き込み中の一時ファイル（.で始まるファイル）は除きます。
+
+        Returns:
+            str: バージョン文字列
+        """
+        signatures = []
+        for watch_dir in self.watch_dirs:
+            for root, dirs, files in os.walk(watch_dir):
+                dirs.sort()
+                for filename in sorted(files):
+                    path = os.path.join(root, filename)
+                    if filename.startswith(".") or (
+                        os.path.normpath(path) in self.excluded_files
+                    ):
+                        continue
+                    signatures.append((path, get_file_signature(path)))
+
+        return hashlib.md5(repr(signatures).encode("utf-8")).hexdigest()[:12]
+
+    def get_content_version(self, force: bool = False) -> str:
+        """
+        プロセスに依存しない、ページの内容のバージョンを取得します。
+        ファイルの確認はVERSION_CHECK_INTERVAL秒に1回までに制限されます。
+
+        Args:
+            force (bool, optional): Trueの場合、間隔に関係なくファイルと出場者データを確認します。
+
+        Returns:
+            str: 出場者データ・ファイル・現在の年を組み合わせたバージョン文字列
+        """
+        now = time.monotonic()
+        if (
+            force
+            or self.files_version is None
+            or now - self._last_checked >= VERSION_CHECK_INTERVAL
+        ):
+            with self._lock:
+                self._last_checked = now
+                self.files_version = self._compute_files_version()
+
+        # 最新年度・試験公開年度の表示は現在の年で変わる
+        return "-".join(
+            (
+                participant_store.refresh(force),
+                self.files_version,
+                str(datetime.now().year),
+            )
+        )
+
+    def get_version(self) -> str:
+        """
+        現在のページのバージョンを取得します。
+
+        Returns:
+            str: ページの内容のバージョンと起動日時を組み合わせたバージョン文字列
+        """
+        # ページに表示する最終更新日時はプロセスごとに異なる
+        return "-".join(
+            (
+                self.get_content_version(),
+                str(current_app.config.get("BUILD_ID", "")),
+            )
+        )
+
+    def get_key(self) -> tuple:
+        """
+        現在のリクエストのキャッシュキーを作成します。
+
+        Returns:
+            tuple: (パス, 並べ替えたクエリ引数, 言語)
+        """
+        args = tuple(sorted(request.args.items(multi=True)))
+        return (request.path, args, session.get("language", "ja"))
+
+    def get_etag(self, key: tuple, version: str) -> str:
+        """
+        ページのETagを作成します。
+        同じバージョン・同じキーのページは同じ内容になるため、描画せずに作成できます。
+
+        Args:
+            key (tuple): キャッシュキー
+            version (str): ページのバージョン
+
+        Returns:
+            str: ETag（引用符なし）
+        """
+        return hashlib.md5(repr((version, key)).encode("utf-8")).hexdigest()
+
+    def _set_validators(self, response, etag: str, weak: bool = False):
+        """
+        レスポンスにETagを設定し、毎回ETagで検証させるようにします。
+        ページの内容はデータの更新で変わるため、検証なしでは再利用させません。
+
+        Args:
+            response (Response): レスポンス
+            etag (str): ETag
+            weak (bool, optional): 弱いETagにするか
+
+        Returns:
+            Response: ETagを設定したレスポンス
+        """
+        response.set_etag(etag, weak=weak)
+        response.cache_control.no_cache = True
+        return response
+
+    def cached(self, view):
+        """
+        ビュー関数の描画結果をキャッシュするデコレーター。
+        GETリクエストで、ステータスが200のレスポンスのみを保存します。
+        設定のPAGE_CACHEが無効の場合は、キャッシュせずにビュー関数を呼び出します。
+        ETagの検証は設定に関係なく行い、クライアントのETagと一致する場合は304を返します。
+
+        Args:
+            view (Callable): ビュー関数
+
+        Returns:
+            Callable: キャッシュ付きのビュー関数
+        """
+
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            if request.method != "GET":
+                return view(*args, **kwargs)
+
+            key = self.get_key()
+            version = self.get_version()
+            etag = self.get_etag(key, version)
+
+            # クライアントの内容が最新の場合は描画しない
+            # （圧縮したレスポンスは弱いETagになるため、弱い比較を使う）
+            if request.if_none_match.contains_weak(etag):
+                # 304のETagは、クライアントが持っているレスポンスと同じ形式にする
+                # （"*"の場合は、圧縮されるレスポンスであれば弱いETag）
+                weak = request.if_none_match.is_weak(etag) or (
+                    request.if_none_match.star_tag
+                    and choose_encoding(request.accept_encodings) is not None
+                )
+                response = current_app.response_class(status=304)
+                return self._set_validators(response, etag, weak)
+
+            use_cache = current_app.config.get("PAGE_CACHE")
+            cached_page = self.pages.get(key, version) if use_cache else None
+            if cached_page is not None:
+                body, status, headers = cached_page
+                response = current_app.response_class(body, status, list(headers))
+                return self._set_validators(response, etag)
+
+            response = make_response(view(*args, **kwargs))
+            if response.status_code != 200 or response.direct_passthrough:
+                return response
+
+            if use_cache:
+                headers = tuple(
+                    (name, value)
+                    for name, value in response.headers.items()
+                    if name not in EXCLUDED_HEADERS
+                )
+                self.pages.set(
+                    key, version, (response.get_data(), response.status_code, headers)
+                )
+
+            return self._set_validators(response, etag)
+
+        return wrapper
+
+
+# グローバルインスタンス
+page_cache = PageCache()
@@ -0,0 +1,201 @@
+"""
+クエリ結果キャッシュモジュール
+同じ引数での関数呼び出し結果を、データバージョン付きでメモリに保持する
+"""
+
+import threading
+from typing import Any, Hashable
+
+from .metrics import MeteredLRUCache, metrics_registry
+
+
+class FrozenDict(dict):
+    """
+    変更できない辞書。
+    キャッシュした結果を呼び出し側が書き換えられないようにするために使用します。
+    dictのサブクラスのため、テンプレートやjsonifyからはそのまま利用できます。
+    """
+
+    def _readonly(self, *args, **kwargs):
+        raise TypeError("cached results are read-only")
+
+    __setitem__ = _readonly
+    __delitem__ = _readonly
+    clear = _readonly
+    pop = _readonly
+    popitem = _readonly
+    setdefault = _readonly
+    update = _readonly
+    __ior__ = _readonly
+
+    def __hash__(self):
+        return hash(tuple(self.items()))
+
+    def __reduce__(self):
+        return (FrozenDict, (dict(self),))
+
+
+def freeze(value: Any) -> Any:
+    """
+    リスト・辞書を再帰的に変更できない型に変換します。
+
+    Args:
+        value (Any): 変換する値
+
+    Returns:
+        Any: list -> tuple, dict -> FrozenDict に変換した値
+    """
+    if isinstance(value, FrozenDict):
+        return value
+    if isinstance(value, dict):
+        return FrozenDict((key, freeze(item)) for key, item in value.items())
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(item) for item in value)
+    return value
+
+
+class QueryCache:
+    """
+    上限付きのクエリ結果キャッシュ。
+    キーは関数の引数のタプル、値は変更できない型に変換した結果です。
+    データバージョンが変わった時点で全エントリを破棄します。
+
+    Attributes:
+        name (str): キャッシュ名
+        maxsize (int): 保持する最大エントリ数
+        version (str): 現在保持しているエントリのデータバージョン
+        hits (int): キャッシュヒット数
+        misses (int): キャッシュミス数
+        metrics (CacheMetrics): 統計レジストリでの記録先
+    """
+
+    def __init__(self, name: str, maxsize: int = 1024):
+        """
+        QueryCacheクラスのコンストラクタ。
+
+        Args:
+            name (str): キャッシュ名
+            maxsize (int, optional): 保持する最大エントリ数。デフォルトは1024。
+
+        Returns:
+            None
+        """
+        self.name = name
+        self.maxsize = maxsize
+        self.version = None
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        # ヒット・ミスは自身で数え、破棄したエントリ数を統計レジストリに記録
+        self.metrics = metrics_registry.register(name, self._metrics_stats)
+        self._entries = self._create_entries()
+
+    def _create_entries(self) -> MeteredLRUCache:
+        """
+        エントリを保持する空のLRUCacheを作成します。
+
+        Returns:
+            MeteredLRUCache: 上限を超えて破棄したエントリ数を記録するLRUCache
+        """
+        return MeteredLRUCache(maxsize=self.maxsize, metrics=self.metrics)
+
+    def _invalidate(self) -> None:
+        """
+        すべてのエントリを破棄します（ロックを取得した状態で呼び出します）。
+        LRUCacheのclear()は1件ずつpopitemで破棄し、上限超過による破棄として数えてしまうため、
+        空のLRUCacheに置き換え、破棄した数は無効化として別に記録します。
+
+        Returns:
+            None
+        """
+        if len(self._entries):
+            self.metrics.increment("invalidations")
+            self.metrics.increment("invalidated_entries", len(self._entries))
+            self._entries = self._create_entries()
+
+    def get(self, key: Hashable, version: str) -> Any:
+        """
+        キャッシュから結果を取得します。
+
+        Args:
+            key (Hashable): 引数のタプル
+            version (str): 現在のデータバージョン
+
+        Returns:
+            Any: キャッシュされた結果。存在しない場合はNone。
+        """
+        with self._lock:
+            if version != self.version:
+                # データが更新されたため、古い結果をすべて破棄
+                self._invalidate()
+                self.version = version
+
+            value = self._entries.get(key)
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            return value
+
+    def set(self, key: Hashable, version: str, value: Any) -> Any:
+        """
+        結果を変更できない型に変換してキャッシュに保存します。
+
+        Args:
+            key (Hashable): 引数のタプル
+            version (str): 結果を計算したときのデータバージョン
+            value (Any): 保存する結果
+
+        Returns:
+            Any: 変更できない型に変換した結果
+        """
+        frozen = freeze(value)
+        with self._lock:
+            # 計算中にデータが更新された場合は保存しない
+            if version == self.version:
+                self._entries[key] = frozen
+        return frozen
+
+    def clear(self) -> None:
+        """
+        すべてのエントリを破棄します。
+
+        Returns:
+            None
+        """
+        with self._lock:
+            self._invalidate()
+
+    def _metrics_stats(self) -> dict:
+        """
+        統計レジストリに渡す統計情報を取得します。
+
+        Returns:
+            dict: エントリ数・上限・ヒット数・ミス数
+        """
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+    def stats(self) -> dict:
+        """
+        キャッシュの統計情報を取得します。
+
+        Returns:
+            dict: エントリ数・上限・ヒット数・ミス数・ヒット率
+        """
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "name": self.name,
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "version": self.version,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0.0,
+            }
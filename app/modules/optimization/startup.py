@@ -5,23 +5,23 @@
 
 import os
 from concurrent.futures import ThreadPoolExecutor
-from functools import lru_cache
 from typing import Any, Dict, List
 
 import pandas as pd
 
 from ..config import AVAILABLE_YEARS
+from ..data.registry import data_registry
 from .cache import persistent_cache
 
 
 class StartupOptimizer:
     """
     起動時の重い処理を最適化するクラス。
-    CSVファイルの並列読み込み、テンプレートファイルのキャッシュ、
+    CSVデータの取得、テンプレートファイルのキャッシュ、
     必要最小限のデータ事前読み込みなどを提供します。
+    CSVデータ自体はデータレジストリが保持します。
 
     Attributes:
-        csv_cache (dict): CSVデータのメモリキャッシュ
         template_cache (dict): テンプレートファイル一覧のキャッシュ
     """
 
@@ -33,14 +33,12 @@ class StartupOptimizer:
         Returns:
             None
         """
-        self.csv_cache = {}
         self.template_cache = {}
 
-    @lru_cache(maxsize=128)
     def get_csv_data(self, year: int) -> pd.DataFrame:
         """
-        指定された年度のCSVデータをキャッシュ機能付きで読み込みます。
-        一度読み込んだデータはメモリ内にキャッシュされ、以降の呼び出しで高速に返されます。
+        指定された年度のCSVデータを取得します。
+        CSVの読み込みはデータレジストリが1回だけ行い、ここでは同じDataFrameを返します。
 
         Args:
             year (int): 読み込む年度
@@ -49,16 +47,7 @@ class StartupOptimizer:
             pd.DataFrame: CSVデータのDataFrame。
                          ファイルが存在しない場合は空のDataFrameを返します。
         """
-        if year in self.csv_cache:
-            return self.csv_cache[year]
-
-        csv_path = os.path.join("app", "database", "participants", f"{year}.csv")
-        if os.path.exists(csv_path):
-            df = pd.read_csv(csv_path)
-            df = df.fillna("")
-            self.csv_cache[year] = df
-            return df
-        return pd.DataFrame()
+        return data_registry.participants.get_beatboxers_df(year)
 
     def load_csvs_parallel(self, years: List[int]) -> Dict[int, pd.DataFrame]:
         """
@@ -85,7 +74,6 @@ class StartupOptimizer:
                     results[year] = pd.DataFrame()
         return results
 
-    @lru_cache(maxsize=32)
     def get_template_files(self, directory: str) -> List[str]:
         """
         指定されたディレクトリのテンプレートファイル一覧をキャッシュ機能付きで取得します。
@@ -141,7 +129,7 @@ class StartupOptimizer:
 
 def load_csv_optimized(year: int) -> pd.DataFrame:
     """
-    指定された年度のCSVファイルを永続的キャッシュ機能付きで読み込みます。
+    指定された年度のCSVデータをデータレジストリから取得します。
 
     Args:
         year (int): 読み込む年度
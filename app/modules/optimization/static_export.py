@@ -0,0 +1,286 @@
+"""
+静的書き出しモジュール
+サイトマップに含まれるページ（年度・コンテンツ・othersのページ）を言語ごとに描画し、
+HTMLファイルとして書き出す
+書き出したページは、クエリ文字列のないリクエストに対してJinjaの描画を行わずに返す
+リバースプロキシからも <書き出し先>/<言語>/<パス>.html（.br, .gz）を直接配信できる
+
+書き出し（デプロイ時に実行）:
+    python -m app.modules.optimization.static_export [--output ディレクトリ] [--lang 言語 ...]
+"""
+
+import argparse
+import json
+import os
+import shutil
+import threading
+
+from flask import current_app, request, send_file, session, url_for
+
+from ..config import AVAILABLE_LANGS, STATIC_EXPORT_DIR
+from ..data.participant_store import get_file_signature
+from .assets import asset_manifest
+from .compression import precompress_directory
+from .metrics import metrics_registry
+from .page_cache import page_cache
+
+# 書き出したページの一覧とバージョンを保存するファイル名
+EXPORT_MANIFEST = "manifest.json"
+
+
+def get_export_version(force: bool = False) -> str:
+    """
+    書き出したページが最新かどうかを判定するためのバージョンを取得します。
+
+    Args:
+        force (bool, optional): Trueの場合、間隔に関係なくファイルと出場者データを確認します。
+
+    Returns:
+        str: ページの内容のバージョンと静的ファイルのバージョンを組み合わせた文字列
+    """
+    # ページには静的ファイルのハッシュ付きのURLが含まれる
+    return f"{page_cache.get_content_version(force)}-{asset_manifest.get_version()}"
+
+
+def get_export_path(export_dir: str, lang: str, path: str) -> str:
+    """
+    書き出したページのファイルのパスを取得します。
+
+    Args:
+        export_dir (str): 書き出し先のディレクトリ
+        lang (str): 言語
+        path (str): ページのURLのパス（/2025/top など）
+
+    Returns:
+        str: ファイルのパス（<書き出し先>/<言語>/2025/top.html など）
+    """
+    return os.path.join(export_dir, lang, *path.strip("/").split("/")) + ".html"
+
+
+def list_export_paths(app, sitemapper) -> list:
+    """
+    サイトマップに登録されたURLの変数から、書き出すページのパスの一覧を作成します。
+
+    Args:
+        app (Flask): Flaskアプリケーション
+        sitemapper (Sitemapper): サイトマップ
+
+    Returns:
+        list: ページのURLのパスのリスト（重複なし、並べ替え済み）
+    """
+    with app.test_request_context():
+        urls = list(sitemapper.urls)
+        for dynamic_endpoint in sitemapper.dynamic_endpoints:
+            urls += dynamic_endpoint.urls
+        paths = {url_for(url.endpoint, **url.url_variables) for url in urls}
+    return sorted(paths)
+
+
+def export_site(
+    app, sitemapper, export_dir: str = STATIC_EXPORT_DIR, langs: list = None
+) -> dict:
+    """
+    ページを言語ごとに描画してHTMLファイルに書き出します。
+    ステータスが200のHTMLのページのみを書き出し、リダイレクトするページ
+    （クエリ文字列が必要な出場者一覧・大会結果など）は書き出しません。
+    一時ディレクトリに書き出してから置き換えるため、書き出し中も以前の書き出しを配信できます。
+    書き出し中にデータ・テンプレートなどが更新された場合は、書き出しを中止します。
+
+    Args:
+        app (Flask): Flaskアプリケーション
+        sitemapper (Sitemapper): サイトマップ
+        export_dir (str, optional): 書き出し先のディレクトリ
+        langs (list, optional): 書き出す言語のリスト。デフォルトは全言語。
+
+    Returns:
+        dict: 言語をキーとした、書き出したページのパスのリスト
+
+    Raises:
+        RuntimeError: 書き出し中にページのバージョンが変わった場合
+    """
+    if langs is None:
+        langs = AVAILABLE_LANGS
+
+    # 書き出し中に以前の書き出しを返さないようにする
+    app.config["STATIC_EXPORT"] = False
+
+    # 言語はセッションで指定するため、秘密鍵がない環境では書き出し用の鍵を使う
+    if not app.secret_key:
+        app.secret_key = os.urandom(16)
+
+    version = get_export_version(force=True)
+    paths = list_export_paths(app, sitemapper)
+
+    tmp_dir = export_dir.rstrip(os.sep) + ".tmp"
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    pages = {}
+    client = app.test_client()
+    for lang in langs:
+        with client.session_transaction() as client_session:
+            client_session["language"] = lang
+
+        pages[lang] = []
+        for path in paths:
+            response = client.get(path)
+            if response.status_code != 200 or response.mimetype != "text/html":
+                continue
+
+            file_path = get_export_path(tmp_dir, lang, path)
+            os.makedirs(os.path.dirname(file_path), exist_ok=True)
+            with open(file_path, "wb") as f:
+                f.write(response.get_data())
+            pages[lang].append(path)
+
+    # 描画中にバージョンが変わった場合、書き出したページがどちらの内容か分からないため中止する
+    if get_export_version(force=True) != version:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        raise RuntimeError(
+            "書き出し中に出場者データ・テンプレートなどが更新されたため、書き出しを中止しました"
+        )
+
+    # リバースプロキシから圧縮済みのファイルを配信できるようにする
+    precompress_directory(tmp_dir)
+
+    with open(os.path.join(tmp_dir, EXPORT_MANIFEST), "w", encoding="utf-8") as f:
+        json.dump({"version": version, "pages": pages}, f, ensure_ascii=False)
+
+    old_dir = export_dir.rstrip(os.sep) + ".old"
+    shutil.rmtree(old_dir, ignore_errors=True)
+    if os.path.exists(export_dir):
+        os.replace(export_dir, old_dir)
+    os.replace(tmp_dir, export_dir)
+    shutil.rmtree(old_dir, ignore_errors=True)
+
+    return pages
+
+
+class StaticExport:
+    """
+    書き出したページを返すクラス。
+    書き出し時のバージョンが現在のページのバージョンと異なる場合
+    （出場者データ・テンプレートなどが更新された場合）は返さず、通常どおり描画させます。
+
+    Attributes:
+        export_dir (str): 書き出し先のディレクトリ
+        version (str): 書き出し時のバージョン
+        pages (frozenset): 書き出したページの (言語, パス) の集合
+        metrics (CacheMetrics): 統計の記録先
+    """
+
+    def __init__(self, export_dir: str = STATIC_EXPORT_DIR):
+        """
+        StaticExportクラスのコンストラクタ。
+
+        Args:
+            export_dir (str, optional): 書き出し先のディレクトリ
+
+        Returns:
+            None
+        """
+        self.export_dir = export_dir
+        self.version = None
+        self.pages = frozenset()
+        self.metrics = metrics_registry.register(
+            "static_export", lambda: {"entries": len(self.pages)}
+        )
+        self._manifest_signature = None
+        self._lock = threading.Lock()
+
+    def load(self) -> None:
+        """
+        書き出したページの一覧を読み込みます。
+        一覧のファイルが前回の読み込みから変わっていない場合は何もしません。
+
+        Returns:
+            None
+        """
+        manifest_path = os.path.join(self.export_dir, EXPORT_MANIFEST)
+        signature = get_file_signature(manifest_path)
+        if signature == self._manifest_signature:
+            return
+
+        with self._lock:
+            try:
+                with open(manifest_path, "r", encoding="utf-8") as f:
+                    manifest = json.load(f)
+            except (OSError, ValueError):
+                manifest = {}
+
+            self.version = manifest.get("version")
+            self.pages = frozenset(
+                (lang, path)
+                for lang, paths in manifest.get("pages", {}).items()
+                for path in paths
+            )
+            self._manifest_signature = signature
+
+    def get_page_path(self, lang: str, path: str):
+        """
+        書き出したページのファイルのパスを取得します。
+
+        Args:
+            lang (str): 言語
+            path (str): ページのURLのパス
+
+        Returns:
+            str | None: ファイルのパス。書き出していない、または古い場合はNone。
+        """
+        self.load()
+        if (lang, path) not in self.pages:
+            return None
+        if self.version != get_export_version():
+            return None
+        return get_export_path(self.export_dir, lang, path)
+
+    def send_page(self):
+        """
+        現在のリクエストに対応する書き出したページを返します。
+        before_requestから呼び出し、Noneの場合は通常どおりビュー関数で描画します。
+
+        Returns:
+            Response | None: 書き出したページのレスポンス。返せない場合はNone。
+        """
+        if (
+            not current_app.config.get("STATIC_EXPORT")
+            or request.method not in ("GET", "HEAD")
+            or request.query_string
+        ):
+            return None
+
+        page_path = self.get_page_path(session.get("language", "ja"), request.path)
+        if page_path is None:
+            self.metrics.increment("misses")
+            return None
+
+        self.metrics.increment("hits")
+        response = send_file(
+            os.path.abspath(page_path), mimetype="text/html", conditional=True
+        )
+        # ページキャッシュと同様に、毎回ETagで検証させる
+        response.cache_control.no_cache = True
+        return response
+
+
+# グローバルインスタンス
+static_export = StaticExport()
+
+
+if __name__ == "__main__":
+    from ...main import app, sitemapper
+
+    parser = argparse.ArgumentParser(description="ページをHTMLファイルに書き出します")
+    parser.add_argument(
+        "--output", default=STATIC_EXPORT_DIR, help="書き出し先のディレクトリ"
+    )
+    parser.add_argument(
+        "--lang",
+        action="append",
+        choices=AVAILABLE_LANGS,
+        help="書き出す言語（複数指定可、デフォルトは全言語）",
+    )
+    args = parser.parse_args()
+
+    exported = export_site(app, sitemapper, args.output, args.lang)
+    for lang, paths in exported.items():
+        print(f"{lang}: {len(paths)}ページを書き出しました")
@@ -24,6 +24,20 @@ if (workbox.navigationPreload.isSupported()) {
     workbox.navigationPreload.enable();
 }
 
+// 内容のハッシュ付きの静的ファイル（/assets/）は内容が変わらないため、キャッシュ優先
+workbox.routing.registerRoute(
+    ({ url }) => url.pathname.startsWith('/assets/'),
+    new workbox.strategies.CacheFirst({
+        cacheName: 'assets',
+        plugins: [
+            new workbox.expiration.ExpirationPlugin({
+                maxEntries: 300,
+                maxAgeSeconds: 365 * 24 * 60 * 60, // 1年間
+            }),
+        ],
+    })
+);
+
 // ネットワーク優先の戦略に変更
 workbox.routing.registerRoute(
     new RegExp('/*'),
@@ -0,0 +1,104 @@
+// 出場者世界地図
+// マーカーデータと国名の辞書をJSONで取得し、Leafletで描画する
+
+// 地図を作成
+function createWorldMap(element) {
+    const map = L.map(element, {
+        center: [20, 0],
+        zoom: 2,
+        minZoom: 1,
+        maxZoom: 8,
+        maxBounds: [[-90, -180], [90, 180]],
+        zoomControl: true,
+        zoomSnap: 0.1,  // ズームのステップを0.1に設定
+        zoomDelta: 0.1,  // ズームの増減を0.1に設定
+    });
+
+    L.tileLayer(
+        "https://server.arcgisonline.com/ArcGIS/rest/services/World_Physical_Map/MapServer/tile/{z}/{y}/{x}",
+        {
+            minZoom: 1,
+            maxZoom: 8,
+            attribution: "Tiles &copy; Esri &mdash; Source: US National Park Service",
+        }
+    ).addTo(map);
+
+    L.control.scale().addTo(map);
+
+    return map;
+}
+
+// 要素を作成してテキストを設定
+function createTextElement(tagName, text, className) {
+    const element = document.createElement(tagName);
+    element.textContent = text;
+    if (className) {
+        element.className = className;
+    }
+    return element;
+}
+
+// ポップアップの内容を作成
+function createPopupContent(marker, countryName) {
+    const popup = document.createElement("div");
+    popup.className = "world-map-popup";
+
+    // ポップアップが長い場合はスクロール可能にする
+    if (marker.teams > 7) {
+        popup.classList.add("scroll");
+    }
+
+    popup.appendChild(createTextElement("h3", countryName));
+
+    const teamInfo = document.createElement("h4");
+    teamInfo.append(`${marker.teams} team(s)`, document.createElement("br"), `${marker.beatboxers} beatboxer(s)`);
+    popup.appendChild(teamInfo);
+
+    // 出場者を追加
+    for (const [name, category, members] of marker.participants) {
+        const paragraph = document.createElement("p");
+        paragraph.append(createTextElement("strong", name), ` (${category})`);
+
+        if (members) {
+            const memberSpan = createTextElement("span", `【${members}】`, "members");
+            memberSpan.prepend(document.createElement("br"));
+            paragraph.appendChild(memberSpan);
+        }
+        popup.appendChild(paragraph);
+    }
+
+    return popup;
+}
+
+// マーカーを地図に追加
+function addMarkers(map, markers, countryNames) {
+    for (const marker of markers) {
+        const countryName = countryNames[marker.iso_code] || marker.flag;
+
+        const flagIcon = L.icon({
+            iconUrl: marker.flag_url,
+            iconSize: [48, 48],  // アイコンのサイズ（幅、高さ）
+            iconAnchor: [24, 48],  // アイコンのアンカー位置
+        });
+
+        L.marker([marker.lat, marker.lon], { icon: flagIcon })
+            .bindPopup(() => createPopupContent(marker, countryName), { maxWidth: 1000 })
+            .bindTooltip(countryName)
+            .addTo(map);
+    }
+}
+
+async function renderWorldMap() {
+    const element = document.getElementById("map");
+    const map = createWorldMap(element);
+
+    // マーカーデータと国名の辞書を並行して取得
+    const [markerData, countryNames] = await Promise.all([
+        fetch(element.dataset.markersUrl).then(response => response.json()),
+        fetch(element.dataset.countriesUrl).then(response => response.json()),
+    ]);
+
+    addMarkers(map, markerData.markers, countryNames);
+}
+
+document.addEventListener("DOMContentLoaded", renderWorldMap);
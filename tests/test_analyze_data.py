@@ -0,0 +1,66 @@
+"""
+データで見るGBB（全年度）のAPIのテスト
+出場者CSVが更新された場合に、集計結果が新しいデータで返されることを確認する
+"""
+
+import os
+import shutil
+
+import pytest
+
+# アプリケーションはリポジトリのルートからの相対パスでファイルを読み込む
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+os.chdir(ROOT_DIR)
+
+# 本番と同じ設定（ファイルキャッシュ・ページキャッシュ有効）で読み込む
+os.environ.pop("ENVIRONMENT_CHECK", None)
+os.environ.setdefault("SECRET_KEY", "test")
+os.environ.setdefault("GEMINI_API_KEY", "test")
+
+from app.main import app, cache  # noqa: E402
+from app.modules.data.participant_store import (  # noqa: E402
+    PARTICIPANTS_DIR,
+    participant_store,
+)
+
+CSV_PATH = os.path.join(PARTICIPANTS_DIR, "2025.csv")
+
+
+@pytest.fixture
+def restore_csv(tmp_path):
+    """
+    テスト中に変更した出場者CSVを元に戻します。
+
+    Args:
+        tmp_path (pathlib.Path): 一時ディレクトリ
+
+    Returns:
+        None
+    """
+    backup_path = tmp_path / "2025.csv"
+    shutil.copy2(CSV_PATH, backup_path)
+    yield
+    shutil.copy2(backup_path, CSV_PATH)
+    participant_store.refresh(force=True)
+
+
+def test_total_analysis_follows_csv_update(restore_csv):
+    """
+    出場者CSVを半分に減らすと、/analyze_data/total の結果が変わることを確認します。
+    """
+    cache.clear()
+    client = app.test_client()
+
+    before = client.get("/analyze_data/total")
+    assert before.status_code == 200
+
+    with open(CSV_PATH, "r", encoding="utf-8") as f:
+        lines = f.readlines()
+    with open(CSV_PATH, "w", encoding="utf-8") as f:
+        f.writelines(lines[: len(lines) // 2])
+    participant_store.refresh(force=True)
+
+    after = client.get("/analyze_data/total")
+    assert after.status_code == 200
+    assert after.get_etag() != before.get_etag()
+    assert after.get_data() != before.get_data()